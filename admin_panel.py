@@ -1,18 +1,48 @@
 """
 Admin Panel for DMTT Application Bot
-A Flask web application to view and manage applications
+A Flask web application to view and manage applications.
+Each campaign (see campaigns.py) is a separate dataset, picked with
+?campaign=<slug> on every route (default: the first campaign).
+
+Startup is kept short: openpyxl (only /export) and python-telegram-bot (only
+Telegram downloads) are imported on first use, and the campaigns' data is
+loaded in a background thread while the server already answers. /readyz
+reports when loading is done.
 """
 
-from flask import Flask, render_template, send_file, jsonify, request
-import csv
+import time
+
+# Process startup, for the import time reported by /readyz
+STARTUP_STARTED = time.perf_counter()
+
+from flask import Flask, render_template, send_file, jsonify, request, Response, abort, g
+import brotli
+import functools
+import gzip
+import hashlib
+import io
 import os
-from datetime import datetime
+import queue
+import re
+import threading
+import zipfile
+from collections import OrderedDict
+from datetime import datetime, timezone
 from dotenv import load_dotenv
-from telegram import Bot
 import asyncio
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from storage import get_store, SORT_FIELDS, FILTER_FIELDS
+from campaigns import CAMPAIGN_STATUSES, load_campaigns
+from search_index import SearchIndex
+from pdf_cache import PdfCache
+from duplicates import DUPLICATE_POLICY, DuplicateIndex
+from live_feed import LiveFeed
+from stats import REVIEWS_FILE, ApplicationStats, ReviewLog, parse_stats_range
+from prefetch import PDF_PREFETCH, PREFETCH_FILE, PdfPrefetcher
+from pdf_checker import PDF_CHECK, PDF_CHECK_FILE, PDF_PROBLEMS, PdfChecker
+from text_index import TEXT_INDEX_FILE, PdfTextIndex
+from telegram_client import TelegramClient
+import metrics
 
 load_dotenv()
 
@@ -20,92 +50,491 @@ app = Flask(__name__)
 app.config['SECRET_KEY'] = os.urandom(24)
 
 # Configuration
-CSV_FILE = "applications.csv"
 BOT_TOKEN = os.getenv("BOT_TOKEN")
 DOWNLOAD_FOLDER = "downloaded_pdfs"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# DUPLICATE_POLICY=replace: applications replaced by a later one are left out of
+# the dashboard, counters, exports and searches (/duplicates still lists them)
+HIDE_SUPERSEDED = DUPLICATE_POLICY == 'replace'
+
+# Concurrent Telegram downloads when building a ZIP of PDFs
+ZIP_FETCH_CONCURRENCY = int(os.getenv("ZIP_FETCH_CONCURRENCY", "8"))
+ZIP_CHUNK_SIZE = 256 * 1024
+
+# /download requests waiting on Telegram at once (each holds a request
+# thread; more get 503) and how long one waits before giving up
+DOWNLOAD_MAX_WAITING = int(os.getenv("DOWNLOAD_MAX_WAITING", "4"))
+DOWNLOAD_TIMEOUT = float(os.getenv("DOWNLOAD_TIMEOUT", "60"))
+
+# Rendered dashboard/API responses kept per dataset version
+RESPONSE_CACHE_SIZE = 64
+COMPRESS_MIN_SIZE = 1024
 
 # Create download folder if it doesn't exist
 os.makedirs(DOWNLOAD_FOLDER, exist_ok=True)
 
+# Campaigns by slug; the first one is shown when a request names none
+CAMPAIGNS = load_campaigns()
+
+# One Bot (pooled HTTP client) on one event loop for all Telegram calls
+telegram_client = TelegramClient(BOT_TOKEN)
+
+# Taken by a /download request while it waits on Telegram
+download_slots = threading.BoundedSemaphore(DOWNLOAD_MAX_WAITING)
+
+# Downloaded PDFs, content-addressed and keyed by Telegram file ids (all campaigns)
+pdf_cache = PdfCache()
+
+class CampaignPanel:
+    """One campaign's data and indexes; requests for it never touch another campaign"""
+
+    def __init__(self, campaign):
+        self.campaign = campaign
+
+        # Application storage (csv or sqlite, selected by STORAGE_BACKEND)
+        self.store = get_store(campaign=campaign)
+
+        # Name/phone/username index (see search_index below)
+        self._search_index = None
+        self._search_lock = threading.Lock()
+
+        # Repeat applications by chat ID / phone / PDF
+        self.duplicate_index = DuplicateIndex()
+        self.store.subscribe(self.duplicate_index)
+
+        # Running totals and per-hour/per-day counts (subscribed before the live
+        # feed, so pushed events carry up-to-date counters)
+        self.app_stats = ApplicationStats(current_only=HIDE_SUPERSEDED)
+        self.store.subscribe(self.app_stats)
+
+        # Which admin opened which application
+        self.review_log = ReviewLog(campaign.path(REVIEWS_FILE))
+
+        # New applications pushed to open dashboards (Server-Sent Events)
+        self.live_feed = LiveFeed(self.store, stats_fn=lambda: application_stats(self))
+        self.store.subscribe(self.live_feed)
+
+        # Background mirroring of new applications' PDFs into the cache
+        self.prefetcher = PdfPrefetcher(self.store, lambda *args: prefetch_pdf(*args),
+                                        telegram_client, path=campaign.path(PREFETCH_FILE))
+
+        # Results of the bot's PDF checks (page count, problems, thumbnails); read only
+        self.pdf_checker = PdfChecker(self.store, path=campaign.path(PDF_CHECK_FILE), cache=pdf_cache)
+
+        # Full-text index of the PDFs' extracted text (written by the bot)
+        self.text_index = PdfTextIndex(campaign.path(TEXT_INDEX_FILE))
+
+        # Last generated Excel export, reused until the applications change
+        self.export_cache = {}
+        self.export_lock = threading.Lock()
+
+        # Seconds the store and indexes took to load (set by get_panel)
+        self.load_seconds = None
+
+    @property
+    def search_index(self):
+        """
+        Name/phone/username index, updated as the store sees new applications.
+        Built on first use (or by the startup loader once the dashboards can be
+        served): it is the slowest index to fill and only search needs it.
+        """
+        if self._search_index is None:
+            with self._search_lock:
+                if self._search_index is None:
+                    index = SearchIndex()
+                    self.store.subscribe(index)
+                    self._search_index = index
+        return self._search_index
+
+    def search_ready(self):
+        return self._search_index is not None
+
+# Loaded campaigns by slug (see get_panel); filled in the background at startup
+panels = {}
+panels_lock = threading.Lock()
+
+# Why a campaign failed to load, by slug (reported by /readyz)
+load_errors = {}
+
+# Rendered responses by (path, query string, dataset version), least recently used first
+response_cache = OrderedDict()
+response_cache_lock = threading.Lock()
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def read_applications():
-    """Read all applications from CSV file"""
-    applications = []
-    
-    if not os.path.exists(CSV_FILE):
-        return applications
-    
+def get_panel(slug):
+    """
+    A campaign's CampaignPanel, loading its store and indexes on first use
+    (requests arriving during the startup load wait for it here)
+    """
+    panel = panels.get(slug)
+    if panel is None:
+        with panels_lock:
+            panel = panels.get(slug)
+            if panel is None:
+                started = time.perf_counter()
+                panel = CampaignPanel(CAMPAIGNS[slug])
+                if PDF_PREFETCH:
+                    panel.prefetcher.start()
+                panel.load_seconds = round(time.perf_counter() - started, 3)
+                panels[slug] = panel
+                load_errors.pop(slug, None)
+    return panel
+
+def load_panels():
+    """
+    Load every campaign, the default (first) one first, then build their
+    search indexes; runs once at startup
+    """
+    started = time.perf_counter()
+    for slug in CAMPAIGNS:
+        try:
+            get_panel(slug)
+        except Exception as e:
+            load_errors[slug] = str(e)
+            print(f"Error loading campaign {slug}: {e}")
+    for panel in list(panels.values()):
+        try:
+            panel.search_index
+        except Exception as e:
+            load_errors[panel.campaign.slug] = str(e)
+            print(f"Error indexing campaign {panel.campaign.slug}: {e}")
+    print(f"✅ {len(panels)}/{len(CAMPAIGNS)} campaign(s) loaded in "
+          f"{time.perf_counter() - started:.2f}s")
+
+def current_panel():
+    """The campaign a request is about (?campaign=<slug>, else the first one); 404 if unknown"""
+    slug = request.args.get('campaign') or next(iter(CAMPAIGNS))
+    if slug not in CAMPAIGNS:
+        abort(404, f"Unknown campaign: {slug}")
+    return get_panel(slug)
+
+def campaign_args(panel):
+    """Query parameters keeping links on the panel's campaign (none with a single campaign)"""
+    return {'campaign': panel.campaign.slug} if len(CAMPAIGNS) > 1 else {}
+
+def read_applications(panel):
+    """Read all applications (newest first) from the campaign's indexed store"""
     try:
-        with open(CSV_FILE, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for idx, row in enumerate(reader, 1):
-                row['id'] = idx
-                applications.append(row)
-        
-        # Sort by date (newest first)
-        applications.reverse()
-        
+        return panel.store.all(current_only=HIDE_SUPERSEDED)
     except Exception as e:
-        print(f"Error reading CSV: {e}")
-    
-    return applications
+        print(f"Error reading applications: {e}")
+        return []
 
-def get_application_stats():
-    """Get statistics about applications"""
-    applications = read_applications()
+def parse_page_args(args):
+    """
+    Parse pagination, sorting and filter query parameters for store.page().
+    Raises ValueError on invalid values.
+    """
+    limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    offset = int(args.get('offset', 0))
+    cursor = args.get('cursor')
+    sort = args.get('sort', 'id')
+    order = args.get('order', 'desc')
+    
+    if not 1 <= limit <= MAX_PAGE_SIZE or offset < 0:
+        raise ValueError("limit must be 1-500 and offset must not be negative")
+    if sort not in SORT_FIELDS:
+        raise ValueError(f"sort must be one of: {', '.join(SORT_FIELDS)}")
+    if order not in ('asc', 'desc'):
+        raise ValueError("order must be asc or desc")
+    
+    date_from = args.get('date_from') or None
+    date_to = args.get('date_to') or None
+    for day in (date_from, date_to):
+        if day:
+            datetime.strptime(day, '%Y-%m-%d')
     
-    total = len(applications)
+    filters = {field: args[field] for field in FILTER_FIELDS if args.get(field)}
+    
+    return {
+        'limit': limit,
+        'offset': offset,
+        'cursor': int(cursor) if cursor else None,
+        'sort': sort,
+        'order': order,
+        'date_from': date_from,
+        'date_to': date_to,
+        'filters': filters,
+        'current_only': HIDE_SUPERSEDED,
+    }
+
+def parse_search_limit(args):
+    """Parse the limit query parameter of the search routes. Raises ValueError on invalid values."""
+    limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError("limit must be 1-500")
+    return limit
+
+def superseded_ids(panel):
+    """
+    Ids of applications replaced by a later one (named as its 'Oldingi ID');
+    none unless DUPLICATE_POLICY=replace
+    """
+    if not HIDE_SUPERSEDED:
+        return set()
+    return panel.store.superseded_ids()
+
+def get_application_stats(panel):
+    """Get statistics about a campaign's applications"""
+    panel.store.refresh()
+    return application_stats(panel)
+
+def application_stats(panel):
+    """
+    Statistics as of the applications seen so far, without refreshing the
+    store: store listeners (the live feed) call it while rows are published
+    """
     today = datetime.now().strftime('%Y-%m-%d')
-    today_count = sum(1 for app in applications if app['Sana'].startswith(today))
+    modified = panel.store.last_modified(refresh=False)
+    last_updated = datetime.fromtimestamp(modified) if modified else datetime.now()
     
     return {
-        'total': total,
-        'today': today_count,
-        'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        'total': panel.app_stats.total,
+        'today': panel.app_stats.count_on(today),
+        'latest_id': panel.app_stats.latest_id,
+        'last_updated': last_updated.strftime('%Y-%m-%d %H:%M:%S')
     }
 
-async def download_pdf_async(file_id, filename):
-    """Download PDF from Telegram asynchronously"""
+def dataset_version(panel):
+    """
+    Changes whenever one of the campaign's applications, reviews, PDF statuses
+    or checks is written (and at midnight, for "today" counts)
+    """
+    return (f"{panel.store.version()}-{panel.review_log.version()}-{panel.prefetcher.version()}-"
+            f"{panel.pdf_checker.version()}-{datetime.now().strftime('%Y-%m-%d')}")
+
+def current_admin():
+    """Name of the admin making the request (from the proxy's HTTP auth, if any)"""
+    if request.authorization and request.authorization.username:
+        return request.authorization.username
+    return request.remote_user or 'admin'
+
+def pick_encoding(size):
+    """Best response encoding the client accepts: br, gzip or identity"""
+    if size < COMPRESS_MIN_SIZE:
+        return 'identity'
+    accepted = request.accept_encodings
+    if accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return 'identity'
+
+def encode_body(body, encoding):
+    """Compress a response body"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+def cached_response(view):
+    """
+    Serve a view from response_cache until the next application is written.
+    Responses carry a strong ETag and Last-Modified (so unchanged data gets a
+    304) and are brotli/gzip compressed once per version.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        panel = current_panel()
+        version = dataset_version(panel)
+        key = (request.path, request.query_string, version)
+        with response_cache_lock:
+            entry = response_cache.get(key)
+            if entry is not None:
+                response_cache.move_to_end(key)
+        
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            body = response.get_data()
+            modified = panel.store.last_modified()
+            entry = {
+                'content_type': response.content_type,
+                'etag': hashlib.sha256(body).hexdigest()[:32],
+                'last_modified': datetime.fromtimestamp(modified, timezone.utc) if modified else None,
+                'bodies': {'identity': body},
+            }
+            with response_cache_lock:
+                response_cache[key] = entry
+                while len(response_cache) > RESPONSE_CACHE_SIZE:
+                    response_cache.popitem(last=False)
+        
+        encoding = pick_encoding(len(entry['bodies']['identity']))
+        body = entry['bodies'].get(encoding)
+        if body is None:
+            body = entry['bodies'][encoding] = encode_body(entry['bodies']['identity'], encoding)
+        
+        response = Response(body, content_type=entry['content_type'])
+        # Each encoding is a different representation, so it gets its own strong ETag
+        response.set_etag(entry['etag'] if encoding == 'identity' else f"{entry['etag']}-{encoding}")
+        response.last_modified = entry['last_modified']
+        response.cache_control.no_cache = True
+        response.vary.add('Accept-Encoding')
+        if encoding != 'identity':
+            response.content_encoding = encoding
+        return response.make_conditional(request)
+    
+    return wrapper
+
+async def download_pdf_async(file_id, filename, bot):
+    """Download PDF from Telegram into the local cache asynchronously"""
     try:
-        bot = Bot(token=BOT_TOKEN)
         file = await bot.get_file(file_id)
         
-        # Create safe filename
-        safe_filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{filename}"
-        filepath = os.path.join(DOWNLOAD_FOLDER, safe_filename)
+        # Same document already cached under its file_unique_id
+        cached = pdf_cache.lookup(file.file_unique_id, file_id)
+        if cached:
+            return cached
         
+        filepath = pdf_cache.temp_path()
         await file.download_to_drive(filepath)
-        return filepath
+        return pdf_cache.store(filepath, file_id, file.file_unique_id)
     except Exception as e:
         print(f"Error downloading PDF: {e}")
         return None
 
+async def prefetch_pdf(file_id, filename, bot):
+    """Mirror a PDF into the local cache ahead of the first download"""
+    return pdf_cache.lookup(file_id) or await download_pdf_async(file_id, filename, bot)
+
 def download_pdf(file_id, filename):
-    """Synchronous wrapper for PDF download"""
-    return asyncio.run(download_pdf_async(file_id, filename))
+    """
+    Serve a PDF from the local cache, downloading it from Telegram on a miss
+    (waiting at most DOWNLOAD_TIMEOUT; the download itself carries on)
+    """
+    cached = pdf_cache.lookup(file_id)
+    if cached:
+        return cached
+    try:
+        return telegram_client.call(lambda bot: download_pdf_async(file_id, filename, bot),
+                                    timeout=DOWNLOAD_TIMEOUT)
+    except Exception as e:
+        print(f"Error downloading PDF: {e}")
+        return None
 
-def create_excel_export():
-    """Create a formatted Excel file from applications data"""
-    applications = read_applications()
+def select_applications(panel, args):
+    """
+    A campaign's applications matching a bulk-download filter, newest first:
+    ids (comma-separated), q (search query), or the /api/applications
+    date range and field filters.
+    """
+    store = panel.store
+    ids = args.get('ids')
+    if ids:
+        apps = [store.get(int(app_id)) for app_id in ids.split(',') if app_id.strip()]
+        return [app for app in apps if app is not None]
     
-    if not applications:
-        return None
+    query = args.get('q', '').strip()
+    if query:
+        store.refresh()
+        return panel.search_index.search(query, limit=max(store.count(), 1),
+                                         exclude=superseded_ids(panel))
+    
+    page_args = parse_page_args(args)
+    page_args.update(limit=max(store.count(), 1), offset=0, cursor=None)
+    return store.page(**page_args)[0]
+
+def zip_entry_name(app):
+    """File name inside the ZIP: id and applicant name"""
+    name = re.sub(r'[\\/:*?"<>|\s]+', '_', app.get('Ism', '').strip()) or 'ariza'
+    return f"{app['id']}_{name}.pdf"
+
+async def fetch_pdfs_async(apps, results, bot):
+    """
+    Put (app, filepath) on the results queue as each PDF becomes available.
+    Cached files come first; missing ones are fetched from Telegram
+    concurrently, at most ZIP_FETCH_CONCURRENCY at a time.
+    """
+    missing = {}
+    for app in apps:
+        cached = pdf_cache.lookup(app.get('File ID'))
+        if cached:
+            results.put((app, cached))
+        else:
+            # Applications sharing a File ID are fetched once
+            missing.setdefault(app.get('File ID'), []).append(app)
+    
+    if not missing:
+        return
+    
+    semaphore = asyncio.Semaphore(ZIP_FETCH_CONCURRENCY)
+    
+    async def fetch(bot, file_id, waiting):
+        filepath = None
+        async with semaphore:
+            if file_id:
+                filepath = await download_pdf_async(file_id, waiting[0].get('Fayl nomi'), bot)
+        for app in waiting:
+            results.put((app, filepath))
+    
+    await asyncio.gather(*(fetch(bot, file_id, waiting) for file_id, waiting in missing.items()))
+
+class ZipStream:
+    """Write-only file object that hands ZIP bytes to a streaming response"""
+    
+    def __init__(self):
+        self.parts = []
     
-    # Create workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Arizalar"
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
     
-    # Define headers
-    headers = ['#', 'Sana', 'Ism', 'Telefon', 'Username', 'Chat ID', 'File ID', 'Fayl nomi']
+    def flush(self):
+        pass
     
-    # Header styling
-    header_fill = PatternFill(start_color="667EEA", end_color="667EEA", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    header_alignment = Alignment(horizontal="center", vertical="center")
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+def stream_pdf_zip(apps):
+    """Yield a ZIP archive of the applications' PDFs as files become available"""
+    results = queue.Queue()
+    fetcher = telegram_client.submit(lambda bot: fetch_pdfs_async(apps, results, bot))
+    # If the fetch fails outright, stop waiting for the rest
+    fetcher.add_done_callback(lambda future: future.exception() and results.put(None))
+    
+    out = ZipStream()
+    failed = []
+    done = set()
+    # PDFs are already compressed; storing them keeps the stream cheap
+    with zipfile.ZipFile(out, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for _ in apps:
+            try:
+                result = results.get(timeout=120)
+            except queue.Empty:
+                result = None
+            if result is None:
+                failed.extend(app for app in apps if app['id'] not in done)
+                break
+            app, filepath = result
+            done.add(app['id'])
+            if not filepath:
+                failed.append(app)
+                continue
+            with open(filepath, 'rb') as src, zf.open(zip_entry_name(app), 'w') as dest:
+                for chunk in iter(lambda: src.read(ZIP_CHUNK_SIZE), b''):
+                    dest.write(chunk)
+                    yield out.drain()
+            yield out.drain()
+        
+        if failed:
+            zf.writestr('xatolar.txt', "Yuklab bo'lmagan arizalar:\n" + "".join(
+                f"{app['id']} - {app.get('Ism', '')}\n" for app in failed
+            ))
+    yield out.drain()
+
+def create_excel_styles(wb):
+    """Register the shared named styles used by the export"""
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+
     border = Border(
         left=Side(style='thin', color='CCCCCC'),
         right=Side(style='thin', color='CCCCCC'),
@@ -113,40 +542,45 @@ def create_excel_export():
         bottom=Side(style='thin', color='CCCCCC')
     )
     
-    # Write headers
-    for col_num, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col_num)
-        cell.value = header
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = header_alignment
-        cell.border = border
+    header = NamedStyle(name='header')
+    header.fill = PatternFill(start_color="667EEA", end_color="667EEA", fill_type="solid")
+    header.font = Font(bold=True, color="FFFFFF", size=12)
+    header.alignment = Alignment(horizontal="center", vertical="center")
+    header.border = border
     
-    # Write data
-    for row_num, app in enumerate(applications, 2):
-        # Reverse order to show newest first
-        data = [
-            app.get('id', ''),
-            app.get('Sana', ''),
-            app.get('Ism', ''),
-            app.get('Telefon', ''),
-            app.get('Username', ''),
-            app.get('Chat ID', ''),
-            app.get('File ID', ''),
-            app.get('Fayl nomi', '')
-        ]
-        
-        for col_num, value in enumerate(data, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = value
-            cell.border = border
-            cell.alignment = Alignment(vertical="center")
-            
-            # Alternate row colors
-            if row_num % 2 == 0:
-                cell.fill = PatternFill(start_color="F8F9FF", end_color="F8F9FF", fill_type="solid")
-    
-    # Auto-adjust column widths
+    row = NamedStyle(name='row')
+    row.alignment = Alignment(vertical="center")
+    row.border = border
+    
+    # Alternate row colors
+    row_alt = NamedStyle(name='row_alt')
+    row_alt.alignment = Alignment(vertical="center")
+    row_alt.border = border
+    row_alt.fill = PatternFill(start_color="F8F9FF", end_color="F8F9FF", fill_type="solid")
+    
+    for style in (header, row, row_alt):
+        wb.add_named_style(style)
+
+def create_excel_export(panel):
+    """
+    Create a formatted Excel file from a campaign's applications and return its bytes.
+    Uses openpyxl's write-only mode, so rows are streamed to the file
+    instead of being held as cell objects in memory.
+    """
+    # Only the export needs openpyxl; importing it here keeps panel startup fast
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    applications = read_applications(panel)
+    
+    if not applications:
+        return None
+    
+    wb = Workbook(write_only=True)
+    create_excel_styles(wb)
+    ws = wb.create_sheet("Arizalar")
+    
+    # Column widths and frozen header must be set before rows are written
     column_widths = {
         'A': 8,   # #
         'B': 20,  # Sana
@@ -155,99 +589,427 @@ def create_excel_export():
         'E': 20,  # Username
         'F': 15,  # Chat ID
         'G': 40,  # File ID
-        'H': 30   # Fayl nomi
+        'H': 30,  # Fayl nomi
+        'I': 12   # Oldingi ID
     }
     
     for col, width in column_widths.items():
         ws.column_dimensions[col].width = width
     
-    # Freeze header row
     ws.freeze_panes = 'A2'
     
-    # Save to file
-    filename = f"DMTT_Arizalar_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    filepath = os.path.join(DOWNLOAD_FOLDER, filename)
-    wb.save(filepath)
+    def styled_row(values, style):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            cells.append(cell)
+        return cells
+    
+    headers = ['#', 'Sana', 'Ism', 'Telefon', 'Username', 'Chat ID', 'File ID', 'Fayl nomi',
+               'Oldingi ID']
+    ws.append(styled_row(headers, 'header'))
+    
+    # Applications are already newest first
+    for row_num, app in enumerate(applications, 2):
+        data = [
+            app.get('id', ''),
+            app.get('Sana', ''),
+            app.get('Ism', ''),
+            app.get('Telefon', ''),
+            app.get('Username', ''),
+            app.get('Chat ID', ''),
+            app.get('File ID', ''),
+            app.get('Fayl nomi', ''),
+            app.get('Oldingi ID', '')
+        ]
+        ws.append(styled_row(data, 'row_alt' if row_num % 2 == 0 else 'row'))
     
-    return filepath
+    output = io.BytesIO()
+    wb.save(output)
+    return output.getvalue()
+
+def export_filename(panel, prefix, extension):
+    """Download file name with the campaign (when there are several) and a timestamp"""
+    campaign = f"_{panel.campaign.slug}" if len(CAMPAIGNS) > 1 else ""
+    return f"{prefix}{campaign}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+def get_excel_export(panel):
+    """
+    Excel export bytes and file name, regenerated only when the
+    campaign's applications changed since the last export.
+    """
+    version = panel.store.version()
+    with panel.export_lock:
+        if panel.export_cache.get('version') != version:
+            content = create_excel_export(panel)
+            if content is None:
+                return None, None
+            panel.export_cache.update(
+                version=version,
+                content=content,
+                filename=export_filename(panel, "DMTT_Arizalar", "xlsx")
+            )
+        return panel.export_cache['content'], panel.export_cache['filename']
+
+def render_dashboard(panel, **context):
+    """Render index.html for a campaign, with the campaign switcher"""
+    return render_template('index.html', campaign=panel.campaign, campaigns=list(CAMPAIGNS.values()),
+                           campaign_statuses=CAMPAIGN_STATUSES, campaign_args=campaign_args(panel),
+                           hide_superseded=HIDE_SUPERSEDED, **context)
 
 # ============================================================================
 # ROUTES
 # ============================================================================
 
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_time(response):
+    """Per-route timing for /metrics"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.REQUEST_SECONDS.labels(
+            request.endpoint or 'unknown', request.method, str(response.status_code)
+        ).observe(time.perf_counter() - started)
+    return response
+
+@app.route('/healthz')
+def healthz():
+    """Liveness probe: the process is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+@app.route('/readyz')
+def readyz():
+    """
+    Readiness probe: 200 once every campaign's data and search index are
+    loaded, 503 until then (or if a campaign failed to load), with the
+    startup timings
+    """
+    campaigns = {}
+    for slug in CAMPAIGNS:
+        panel = panels.get(slug)
+        campaigns[slug] = {
+            'loaded': panel is not None,
+            'search_ready': panel is not None and panel.search_ready(),
+            'load_s': panel.load_seconds if panel else None,
+            'error': load_errors.get(slug),
+        }
+    ready = all(campaign['search_ready'] and not campaign['error'] for campaign in campaigns.values())
+    response = jsonify({'ready': ready, 'import_s': IMPORT_SECONDS, 'campaigns': campaigns})
+    response.status_code = 200 if ready else 503
+    response.cache_control.no_store = True
+    return response
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus metrics of this panel process"""
+    return Response(generate_latest(metrics.panel_registry), content_type=CONTENT_TYPE_LATEST)
+
 @app.route('/')
+@cached_response
 def index():
-    """Main dashboard page"""
-    applications = read_applications()
-    stats = get_application_stats()
-    return render_template('index.html', applications=applications, stats=stats)
+    """Main dashboard page (one page of the table at a time)"""
+    panel = current_panel()
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        page_args = parse_page_args(request.args)
+    except ValueError as e:
+        return str(e), 400
+    
+    page_args['offset'] = (page - 1) * page_args['limit']
+    applications, total = panel.store.page(**page_args)
+    stats = get_application_stats(panel)
+    pagination = {
+        'page': page,
+        'pages': max((total + page_args['limit'] - 1) // page_args['limit'], 1),
+        'total': total,
+        'limit': page_args['limit'],
+    }
+    # Live rows are only inserted into the unfiltered first page
+    live = page == 1 and set(request.args) <= {'page', 'limit', 'campaign'}
+    pdf_statuses = panel.prefetcher.statuses(app['id'] for app in applications)
+    pdf_checks = panel.pdf_checker.results(app['id'] for app in applications)
+    return render_dashboard(panel, applications=applications, stats=stats,
+                            pagination=pagination, live=live, pdf_statuses=pdf_statuses,
+                            pdf_checks=pdf_checks, pdf_problems=PDF_PROBLEMS)
 
 @app.route('/api/applications')
+@cached_response
 def api_applications():
-    """API endpoint to get all applications as JSON"""
-    applications = read_applications()
-    return jsonify(applications)
+    """
+    API endpoint to get applications as JSON, one page at a time.
+    Query parameters: limit, offset, cursor (last id of the previous page),
+    sort (id/date/name), order (asc/desc), date_from, date_to (YYYY-MM-DD),
+    phone, chat_id, username, campaign.
+    """
+    panel = current_panel()
+    try:
+        page_args = parse_page_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    applications, total = panel.store.page(**page_args)
+    next_cursor = None
+    if page_args['sort'] == 'id' and len(applications) == page_args['limit']:
+        next_cursor = applications[-1]['id']
+    
+    # Local mirror status of each PDF: pending, downloading, done or failed
+    statuses = panel.prefetcher.statuses(app['id'] for app in applications)
+    # Content check: status, problem, pages, ... (None until the bot has queued it)
+    checks = panel.pdf_checker.results(app['id'] for app in applications)
+    applications = [dict(app, pdf_status=statuses.get(app['id'], ''), pdf_check=checks.get(app['id']))
+                    for app in applications]
+    
+    return jsonify({
+        'applications': applications,
+        'total': total,
+        'limit': page_args['limit'],
+        'offset': page_args['offset'],
+        'next_cursor': next_cursor,
+    })
 
 @app.route('/api/stats')
+@cached_response
 def api_stats():
-    """API endpoint to get statistics"""
-    stats = get_application_stats()
+    """
+    API endpoint to get statistics: current totals, applications per hour or
+    day with peak load for a range, and reviewed counts per admin.
+    Query parameters: from, to (YYYY-MM-DD), interval (hour/day), campaign.
+    """
+    panel = current_panel()
+    try:
+        start, end, interval = parse_stats_range(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    stats = get_application_stats(panel)
+    stats['range'] = panel.app_stats.summary(start, end, interval)
+    stats['reviewed'] = panel.review_log.counts()
     return jsonify(stats)
 
+@app.route('/api/campaigns')
+def api_campaigns():
+    """Configured campaigns with their window, status and application count"""
+    return jsonify([
+        {
+            'slug': slug,
+            'title': panel.campaign.title,
+            'opens': panel.campaign.opens.isoformat() if panel.campaign.opens else None,
+            'closes': panel.campaign.closes.isoformat() if panel.campaign.closes else None,
+            'status': panel.campaign.status(),
+            'applications': panel.app_stats.total,
+        }
+        for slug, panel in ((slug, get_panel(slug)) for slug in CAMPAIGNS)
+    ])
+
+@app.route('/api/prefetch')
+def api_prefetch():
+    """Progress of the background PDF prefetch (applications per status)"""
+    return jsonify({'enabled': PDF_PREFETCH, 'progress': current_panel().prefetcher.progress()})
+
+@app.route('/api/pdf-checks')
+def api_pdf_checks():
+    """Progress of the bot's PDF checks (applications per status)"""
+    return jsonify({'enabled': PDF_CHECK, 'progress': current_panel().pdf_checker.progress()})
+
+@app.route('/api/events')
+def api_events():
+    """Server-Sent Events stream of new applications and updated counters"""
+    panel = current_panel()
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+    
+    stream = panel.live_feed.open_stream(last_event_id)
+    if stream is None:
+        # Every stream slot is taken; the dashboard polls /api/stats instead
+        return jsonify({'error': 'too many live streams, poll /api/stats'}), 503, \
+            {'Retry-After': '30'}
+    return Response(
+        stream,
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/duplicates')
+def duplicates():
+    """Applicants who applied more than once, grouped, newest first"""
+    panel = current_panel()
+    panel.store.refresh()
+    groups = panel.duplicate_index.groups()
+    applications = [app for group in groups for app in reversed(group)]
+    pagination = {'page': 1, 'pages': 1, 'total': len(applications), 'limit': len(applications)}
+    return render_dashboard(panel, applications=applications,
+                            stats=get_application_stats(panel), pagination=pagination,
+                            duplicates_view=True, superseded=superseded_ids(panel))
+
+@app.route('/api/duplicates')
+def api_duplicates():
+    """API endpoint to get repeat applications grouped by applicant"""
+    panel = current_panel()
+    panel.store.refresh()
+    groups = panel.duplicate_index.groups()
+    superseded = superseded_ids(panel)
+    return jsonify({
+        'policy': DUPLICATE_POLICY,
+        'groups': [
+            {
+                'current_id': group[-1]['id'],
+                'applications': [dict(app, superseded=app['id'] in superseded)
+                                 for app in reversed(group)],
+            }
+            for group in groups
+        ],
+    })
+
 @app.route('/download/<int:app_id>')
 def download(app_id):
     """Download PDF for a specific application"""
-    applications = read_applications()
+    panel = current_panel()
+    app = panel.store.get(app_id)
     
-    if app_id < 1 or app_id > len(applications):
+    if app is None:
         return "Application not found", 404
     
-    app = applications[app_id - 1]
     file_id = app.get('File ID')
     filename = app.get('Fayl nomi', 'document.pdf')
     
     if not file_id:
         return "File ID not found", 404
     
-    # Download PDF from Telegram
-    filepath = download_pdf(file_id, filename)
+    # Local cache first, Telegram only on a miss (a few at a time, see DOWNLOAD_MAX_WAITING)
+    filepath = pdf_cache.lookup(file_id)
+    if filepath is None:
+        if not download_slots.acquire(blocking=False):
+            return "Too many downloads in progress, try again shortly", 503, {'Retry-After': '10'}
+        try:
+            filepath = download_pdf(file_id, filename)
+        finally:
+            download_slots.release()
     
     if filepath and os.path.exists(filepath):
-        return send_file(filepath, as_attachment=True, download_name=filename)
+        panel.review_log.record(app_id, current_admin())
+        # Content hash as ETag; conditional and Range requests are answered from disk
+        return send_file(filepath, as_attachment=True, download_name=filename,
+                         conditional=True, etag=pdf_cache.digest_of(filepath),
+                         max_age=3600)
     else:
         return "Error downloading file", 500
 
+@app.route('/thumbnail/<int:app_id>')
+def thumbnail(app_id):
+    """First-page thumbnail (PNG) of an application's PDF, once the bot has checked it"""
+    check = current_panel().pdf_checker.results([app_id]).get(app_id)
+    if not check or not check['digest']:
+        return "Thumbnail not found", 404
+    
+    filepath = pdf_cache.derived_path(check['digest'], '.png')
+    if not os.path.exists(filepath):
+        return "Thumbnail not found", 404
+    return send_file(filepath, mimetype='image/png', conditional=True,
+                     etag=check['digest'], max_age=86400)
+
+@app.route('/download/zip')
+def download_zip():
+    """
+    Download the PDFs of all (or filtered) applications as one ZIP.
+    Filters: ids=1,2,3 / q=<search query> / date_from, date_to, phone, chat_id, username
+    """
+    panel = current_panel()
+    try:
+        apps = select_applications(panel, request.args)
+    except ValueError as e:
+        return str(e), 400
+    
+    if not apps:
+        return "No applications found", 404
+    
+    filename = export_filename(panel, "DMTT_Arizalar_PDF", "zip")
+    return Response(
+        stream_pdf_zip(apps),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
 @app.route('/export')
 def export_excel():
-    """Export all applications as formatted Excel file"""
-    filepath = create_excel_export()
+    """Export all of a campaign's applications as formatted Excel file"""
+    content, filename = get_excel_export(current_panel())
     
-    if filepath and os.path.exists(filepath):
-        filename = os.path.basename(filepath)
-        return send_file(filepath, as_attachment=True, download_name=filename)
+    if content:
+        return send_file(
+            io.BytesIO(content),
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name=filename
+        )
     else:
         return "No applications found", 404
 
 @app.route('/search')
 def search():
-    """Search applications"""
-    query = request.args.get('q', '').lower()
+    """Search applications by name, phone or username (best matches first)"""
+    query = request.args.get('q', '').strip()
+    panel = current_panel()
     
     if not query:
         return jsonify([])
     
-    applications = read_applications()
-    results = []
+    try:
+        limit = parse_search_limit(request.args)
+    except ValueError:
+        return jsonify({'error': 'limit must be a number from 1 to 500'}), 400
+    
+    # Pick up applications added since the last request
+    panel.store.refresh()
+    results = panel.search_index.search(query, limit, exclude=superseded_ids(panel))
+    
+    return jsonify(results)
+
+@app.route('/search/documents')
+def search_documents():
+    """
+    Search inside the applications' PDFs (best matches first); each result
+    carries an HTML snippet with the matches in <mark> and a relevance score
+    """
+    query = request.args.get('q', '').strip()
+    panel = current_panel()
+    
+    if not query:
+        return jsonify([])
     
-    for app in applications:
-        # Search in name, phone, and username
-        if (query in app.get('Ism', '').lower() or 
-            query in app.get('Telefon', '').lower() or 
-            query in app.get('Username', '').lower()):
-            results.append(app)
+    try:
+        limit = parse_search_limit(request.args)
+    except ValueError:
+        return jsonify({'error': 'limit must be a number from 1 to 500'}), 400
     
+    try:
+        matches = panel.text_index.search(query, limit)
+    except Exception as e:
+        print(f"Error searching PDF text: {e}")
+        return jsonify({'error': 'search failed'}), 400
+    
+    superseded = superseded_ids(panel)
+    results = []
+    for match in matches:
+        app = panel.store.get(match['id'])
+        if app is not None and app['id'] not in superseded:
+            results.append(dict(app, snippet=match['snippet'], score=match['score']))
     return jsonify(results)
 
+# ============================================================================
+# STARTUP
+# ============================================================================
+
+IMPORT_SECONDS = round(time.perf_counter() - STARTUP_STARTED, 3)
+
+# Requests are served (or wait in get_panel) while the campaigns load
+threading.Thread(target=load_panels, name='campaign-loader', daemon=True).start()
+
 # ============================================================================
 # MAIN
 # ============================================================================
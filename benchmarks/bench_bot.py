@@ -0,0 +1,165 @@
+"""
+Bot conversation benchmark for DMTT Application Bot
+Runs N synthetic applicants concurrently through /start -> name -> phone ->
+PDF against the real handlers (bot.build_application()), with the Bot API
+replaced by the in-process fake. Measures per-step reply latency, whole
+conversations and applicants per minute.
+
+    python benchmarks/bench_bot.py --users 500 --concurrent-updates 64 --save
+    python benchmarks/bench_bot.py --users 500 --compare benchmarks/results/bot-....json
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+import common
+from fake_bot_api import FakeBotApi
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+FIRST_CHAT_ID = 500000000
+
+# step name -> number of replies the bot sends for it
+STEPS = [('start', 2), ('name', 1), ('phone', 1), ('pdf', 1)]
+
+# ============================================================================
+# SYNTHETIC APPLICANT
+# ============================================================================
+
+def make_update(bot, update_id, chat_id, step):
+    """Telegram Update for one conversation step"""
+    from telegram import Update
+
+    message = {
+        'message_id': update_id,
+        'date': int(time.time()),
+        'chat': {'id': chat_id, 'type': 'private'},
+        'from': {'id': chat_id, 'is_bot': False, 'first_name': 'Test',
+                 'username': f"applicant{chat_id}"},
+    }
+    if step == 'start':
+        message.update(text='/start', entities=[{'type': 'bot_command', 'offset': 0, 'length': 6}])
+    elif step == 'name':
+        message['text'] = f"Test Applicant {chat_id}"
+    elif step == 'phone':
+        message['text'] = f"+99890{chat_id % 10000000:07d}"
+    else:
+        message['document'] = {
+            'file_id': f"BENCH{chat_id}", 'file_unique_id': f"UBENCH{chat_id}",
+            'file_name': 'ariza.pdf', 'mime_type': 'application/pdf', 'file_size': 200 * 1024,
+        }
+    return Update.de_json({'update_id': update_id, 'message': message}, bot)
+
+async def applicant(application, api, chat_id, step_times, conversation_times):
+    """One user going through the whole conversation, waiting for each reply"""
+    started = time.perf_counter()
+    expected = 0
+    for step, replies in STEPS:
+        expected += replies
+        sent = time.perf_counter()
+        update_id = chat_id * 10 + len(step_times[step])
+        await application.update_queue.put(make_update(application.bot, update_id, chat_id, step))
+        await api.wait_replies(chat_id, expected)
+        step_times[step].append(time.perf_counter() - sent)
+    conversation_times.append(time.perf_counter() - started)
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+async def run(users, ramp, api_delay):
+    api = FakeBotApi(api_delay=api_delay)
+    os.environ.update(BOT_TOKEN='123456:BENCHMARK', ADMIN_CHAT_ID='1',
+                      BOT_API_BASE_URL=api.start())
+
+    # bot.py reads its configuration at import time
+    import bot
+    logging.getLogger().setLevel(logging.WARNING)
+    # Without CAMPAIGNS_FILE everything goes to the default campaign
+    intake = next(iter(bot.intakes.values()))
+
+    bot.init_csv()
+    application = bot.build_application()
+    await application.initialize()
+    await application.post_init(application)
+    await application.start()
+
+    step_times = {step: [] for step, _ in STEPS}
+    conversation_times = []
+    started = time.perf_counter()
+    tasks = []
+    for index in range(users):
+        tasks.append(asyncio.create_task(applicant(
+            application, api, FIRST_CHAT_ID + index, step_times, conversation_times
+        )))
+        if ramp:
+            await asyncio.sleep(ramp / users)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    # Admin notifications go out in the background; time until all are delivered
+    while bot.notifier.pending():
+        await asyncio.sleep(0.05)
+    notified = time.perf_counter() - started
+
+    # PDF checks (download + parse in the process pool) also run in the background
+    if bot.PDF_CHECK:
+        while True:
+            progress = intake.pdf_checker.progress()
+            if not progress['pending'] and not progress['checking']:
+                break
+            await asyncio.sleep(0.05)
+    checked = time.perf_counter() - started
+
+    await application.stop()
+    await application.post_stop(application)
+    await application.shutdown()
+    api.stop()
+
+    results = {f"bot.step.{step}": common.summarize(times) for step, times in step_times.items()}
+    results['bot.conversation'] = common.summarize(conversation_times, elapsed)
+    results['bot.applicants_per_minute'] = round(users / elapsed * 60, 1)
+    results['bot.all_admins_notified_s'] = round(notified, 3)
+    if bot.PDF_CHECK:
+        results['bot.all_pdfs_checked_s'] = round(checked, 3)
+        results['bot.pdf_checks'] = intake.pdf_checker.progress()
+    results['bot.stored_applications'] = intake.store.count()
+    results['bot.api_calls'] = dict(api.calls)
+    return results
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=200, help="concurrent applicants")
+    parser.add_argument('--ramp', type=float, default=0.0,
+                        help="seconds over which applicants arrive (0 = all at once)")
+    parser.add_argument('--concurrent-updates', type=int, default=1,
+                        help="CONCURRENT_UPDATES for the bot")
+    parser.add_argument('--storage', choices=('csv', 'sqlite'), default='csv')
+    parser.add_argument('--api-delay', type=float, default=0.0,
+                        help="simulated Telegram latency per API call (seconds)")
+    parser.add_argument('--save', action='store_true', help="save results to benchmarks/results/")
+    parser.add_argument('--compare', help="results file to compare against")
+    args = parser.parse_args()
+
+    # Applications, outbox and conversation state go to a scratch directory
+    os.chdir(tempfile.mkdtemp(prefix='dmtt-bench-bot-'))
+    os.environ.update(CONCURRENT_UPDATES=str(args.concurrent_updates),
+                      STORAGE_BACKEND=args.storage)
+
+    results = asyncio.run(run(args.users, args.ramp, args.api_delay))
+    results['bot.settings'] = vars(args)
+    common.print_results(results)
+    if args.save:
+        print(f"\nSaved to {common.save_results('bot', results)}")
+    if args.compare:
+        common.compare_results(results, args.compare)
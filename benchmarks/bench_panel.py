@@ -0,0 +1,152 @@
+"""
+Admin panel benchmark for DMTT Application Bot
+Times /, /api/applications, /search, /export and /download against 1k / 10k /
+100k-row datasets. Each size runs in a fresh process with its own scratch
+directory; PDF downloads go to the fake Bot API.
+
+    python benchmarks/bench_panel.py --sizes 1000,10000,100000 --save
+    python benchmarks/bench_panel.py --storage sqlite --compare benchmarks/results/panel-....json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import common
+from generate_dataset import STANDARD_SIZES, standard_dataset
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+SEARCH_TERMS = ['aziz', 'karim', 'Рахим', '90', '1234', 'user12', 'sardor yus', "o'tkir"]
+
+# ============================================================================
+# WORKER (one dataset size, in its own process)
+# ============================================================================
+
+def start_fake_api(file_delay):
+    """Fake Bot API on a background loop thread; returns its base URL"""
+    from fake_bot_api import FakeBotApi
+
+    api = FakeBotApi(file_delay=file_delay)
+
+    async def start():
+        return api.start()
+
+    loop = asyncio.new_event_loop()
+    base_url = loop.run_until_complete(start())
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return base_url
+
+def timed(client, paths, headers=None):
+    """GET each path; returns latencies in seconds (non-200 answers abort the run)"""
+    samples = []
+    for path in paths:
+        started = time.perf_counter()
+        response = client.get(path, headers=headers)
+        body = response.get_data()
+        samples.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path}: HTTP {response.status_code} {body[:200]!r}")
+    return samples
+
+def measure(name, results, client, paths, headers=None):
+    started = time.perf_counter()
+    samples = timed(client, paths, headers)
+    results[name] = common.summarize(samples, time.perf_counter() - started)
+
+def run_size(size, requests, storage, file_delay):
+    """Benchmark the panel on one dataset size; returns {measurement: summary}"""
+    rng = random.Random(size)
+    shutil.copy(standard_dataset(size), 'applications.csv')
+    os.environ.update(BOT_TOKEN='123456:BENCHMARK', STORAGE_BACKEND=storage,
+                      BOT_API_BASE_URL=start_fake_api(file_delay))
+    if storage == 'sqlite':
+        from storage import SqliteApplicationStore
+        SqliteApplicationStore().import_csv('applications.csv')
+
+    prefix = f"panel.{size}"
+    results = {}
+
+    # Import indexes everything (store, search, duplicates, stats)
+    started = time.perf_counter()
+    import admin_panel
+    results[f"{prefix}.startup_s"] = round(time.perf_counter() - started, 3)
+    client = admin_panel.app.test_client()
+
+    pages = max(size // 50, 1)
+    # Distinct pages/offsets miss the response cache; a fixed URL hits it
+    measure(f"{prefix}.dashboard", results, client,
+            [f"/?page={rng.randint(1, pages)}" for _ in range(requests)])
+    measure(f"{prefix}.api_applications", results, client,
+            [f"/api/applications?offset={rng.randrange(size)}&limit=50" for _ in range(requests)])
+    measure(f"{prefix}.api_applications_cached", results, client,
+            ["/api/applications?limit=50"] * requests)
+    measure(f"{prefix}.api_applications_filtered", results, client,
+            [f"/api/applications?date_from=2025-12-1{rng.randint(0, 3)}&sort=name&limit=50"
+             for _ in range(requests)])
+    measure(f"{prefix}.api_stats", results, client,
+            [f"/api/stats?from=2025-12-0{rng.randint(1, 9)}&to=2025-12-13" for _ in range(requests)])
+    measure(f"{prefix}.search", results, client,
+            [f"/search?q={rng.choice(SEARCH_TERMS)}{'' if rng.random() < 0.5 else rng.randint(0, 9)}"
+             for _ in range(requests)])
+
+    # Export: first build, then answered from the export cache
+    measure(f"{prefix}.export_build", results, client, ["/export"])
+    measure(f"{prefix}.export_cached", results, client, ["/export"] * min(requests, 20))
+
+    # Download: Telegram fetch on first request, local cache afterwards
+    ids = rng.sample(range(1, size + 1), min(requests, size))
+    measure(f"{prefix}.download_first", results, client, [f"/download/{i}" for i in ids])
+    measure(f"{prefix}.download_cached", results, client, [f"/download/{i}" for i in ids])
+    return results
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', default=",".join(map(str, STANDARD_SIZES)),
+                        help="comma-separated dataset sizes")
+    parser.add_argument('--requests', type=int, default=200, help="requests per endpoint")
+    parser.add_argument('--storage', choices=('csv', 'sqlite'), default='csv')
+    parser.add_argument('--file-delay', type=float, default=0.0,
+                        help="simulated Telegram file download time (seconds)")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--save', action='store_true', help="save results to benchmarks/results/")
+    parser.add_argument('--compare', help="results file to compare against")
+    args = parser.parse_args()
+
+    if args.worker:
+        os.chdir(tempfile.mkdtemp(prefix='dmtt-bench-panel-'))
+        results = run_size(args.worker, args.requests, args.storage, args.file_delay)
+        print(json.dumps(results))
+        sys.exit(0)
+
+    results = {}
+    for size in (int(size) for size in args.sizes.split(',')):
+        standard_dataset(size)
+        print(f"Benchmarking {size} applications...", flush=True)
+        worker = subprocess.run(
+            [sys.executable, __file__, '--worker', str(size), '--requests', str(args.requests),
+             '--storage', args.storage, '--file-delay', str(args.file_delay)],
+            stdout=subprocess.PIPE, text=True, check=True
+        )
+        results.update(json.loads(worker.stdout.strip().splitlines()[-1]))
+
+    results['panel.settings'] = {key: value for key, value in vars(args).items() if key != 'worker'}
+    common.print_results(results)
+    if args.save:
+        print(f"\nSaved to {common.save_results('panel', results)}")
+    if args.compare:
+        common.compare_results(results, args.compare)
@@ -0,0 +1,174 @@
+"""
+Startup benchmark for DMTT Application Bot
+Cold starts of the admin panel and the bot, each in a fresh process with its
+own scratch directory and a generated applications.csv:
+
+- import time per module (python -X importtime), slowest first
+- panel: process start -> module imported, first dashboard response, /readyz 200
+- bot:   process start -> module imported, application built (ready to poll)
+
+    python benchmarks/bench_startup.py --size 10000 --runs 5 --save
+    python benchmarks/bench_startup.py --compare benchmarks/results/startup-....json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import common
+from generate_dataset import standard_dataset
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+TARGETS = {'panel': 'admin_panel', 'bot': 'bot'}
+
+# Modules listed per target in the import breakdown
+TOP_IMPORTS = 12
+
+# The startup path needs no Telegram access
+BENCH_ENV = {'BOT_TOKEN': '123456:BENCHMARK', 'ADMIN_CHAT_ID': '1', 'PDF_PREFETCH': '0'}
+
+# ============================================================================
+# WORKER (one cold start, in its own process)
+# ============================================================================
+
+def start_panel(spawned):
+    """Seconds from process start to import, first dashboard and readiness"""
+    import admin_panel
+    imported = time.time()
+
+    client = admin_panel.app.test_client()
+    response = client.get('/')
+    if response.status_code != 200:
+        raise SystemExit(f"/ answered {response.status_code}")
+    dashboard = time.time()
+
+    while client.get('/readyz').status_code != 200:
+        time.sleep(0.005)
+    ready = time.time()
+    return {'import': imported - spawned, 'first_dashboard': dashboard - spawned,
+            'ready': ready - spawned}
+
+def start_bot(spawned):
+    """Seconds from process start to import and a built Application"""
+    import logging
+    import bot
+    imported = time.time()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    bot.init_csv()
+    bot.build_application()
+    return {'import': imported - spawned, 'ready': time.time() - spawned}
+
+# ============================================================================
+# MEASUREMENTS
+# ============================================================================
+
+def scratch_dir(dataset):
+    """Fresh working directory holding a copy of the dataset"""
+    path = tempfile.mkdtemp(prefix='dmtt-bench-startup-')
+    shutil.copy(dataset, os.path.join(path, 'applications.csv'))
+    return path
+
+def child_env():
+    return dict(os.environ, PYTHONPATH=common.REPO_DIR, **BENCH_ENV)
+
+def import_times(code, cwd):
+    """[(depth, module, cumulative ms)] from python -X importtime -c code"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=cwd, env=child_env(), capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"{code} failed:\n{result.stderr[-2000:]}")
+
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name[1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        times.append((depth, name.strip(), int(cumulative) / 1000))
+    return times
+
+def import_breakdown(target, dataset):
+    """
+    Cumulative import time (ms) of the modules the target imports directly,
+    slowest first, from python -X importtime
+    """
+    module = TARGETS[target]
+    cwd = scratch_dir(dataset)
+    # Imported by the interpreter itself (site, .pth files), not by the target
+    preloaded = {name for _, name, _ in import_times("pass", cwd)}
+
+    times = {}
+    total = 0.0
+    for depth, name, ms in import_times(f"import {module}", cwd):
+        if depth == 1 and name not in preloaded:
+            times[name] = ms
+        elif depth == 0 and name == module:
+            total = ms
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+    results = {f"startup.{target}.import_total_ms": round(total, 1)}
+    for name, ms in slowest:
+        results[f"startup.{target}.import.{name}_ms"] = round(ms, 1)
+    return results
+
+def cold_start(target, dataset):
+    """One cold start in a new process; returns {phase: seconds since spawn}"""
+    spawned = time.time()
+    worker = subprocess.run(
+        [sys.executable, __file__, '--worker', target, '--spawned', repr(spawned)],
+        cwd=scratch_dir(dataset), env=child_env(), stdout=subprocess.PIPE, text=True, check=True
+    )
+    # The panel's background loader may print after the result
+    lines = [line for line in worker.stdout.splitlines() if line.startswith('{')]
+    return json.loads(lines[-1])
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=10000, help="applications in the dataset")
+    parser.add_argument('--runs', type=int, default=5, help="cold starts per process")
+    parser.add_argument('--targets', default=",".join(TARGETS), help="comma-separated: panel, bot")
+    parser.add_argument('--worker', choices=TARGETS, help=argparse.SUPPRESS)
+    parser.add_argument('--spawned', type=float, help=argparse.SUPPRESS)
+    parser.add_argument('--save', action='store_true', help="save results to benchmarks/results/")
+    parser.add_argument('--compare', help="results file to compare against")
+    args = parser.parse_args()
+
+    if args.worker:
+        start = start_panel if args.worker == 'panel' else start_bot
+        print(json.dumps(start(args.spawned)), flush=True)
+        sys.exit(0)
+
+    dataset = standard_dataset(args.size)
+    results = {}
+    for target in args.targets.split(','):
+        print(f"Starting {target} {args.runs} time(s) on {args.size} applications...", flush=True)
+        samples = {}
+        for _ in range(args.runs):
+            for phase, seconds in cold_start(target, dataset).items():
+                samples.setdefault(phase, []).append(seconds)
+        for phase, values in samples.items():
+            results[f"startup.{target}.{phase}"] = common.summarize(values)
+        results.update(import_breakdown(target, dataset))
+
+    results['startup.settings'] = {key: value for key, value in vars(args).items()
+                                   if key not in ('worker', 'spawned')}
+    common.print_results(results)
+    if args.save:
+        print(f"\nSaved to {common.save_results('startup', results)}")
+    if args.compare:
+        common.compare_results(results, args.compare)
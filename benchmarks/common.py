@@ -0,0 +1,106 @@
+"""
+Shared helpers for the DMTT benchmarks: latency summaries, result files and
+comparison against a saved baseline.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# The repo's modules (bot, admin_panel, storage, ...) are top-level files
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def percentile(sorted_values, p):
+    """p-th percentile (0-100) of an ascending list, nearest-rank"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(p / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+def summarize(samples, elapsed=None):
+    """Latency summary in milliseconds (samples in seconds), plus throughput if elapsed is given"""
+    values = sorted(samples)
+    summary = {
+        'count': len(values),
+        'mean_ms': round(1000 * sum(values) / len(values), 3) if values else 0.0,
+        'p50_ms': round(1000 * percentile(values, 50), 3),
+        'p95_ms': round(1000 * percentile(values, 95), 3),
+        'p99_ms': round(1000 * percentile(values, 99), 3),
+        'max_ms': round(1000 * values[-1], 3) if values else 0.0,
+    }
+    if elapsed:
+        summary['per_second'] = round(len(values) / elapsed, 2)
+    return summary
+
+def environment():
+    """Where and on what the numbers were measured"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+def save_results(name, results):
+    """Write results to benchmarks/results/<name>-<timestamp>.json and return the path"""
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    return path
+
+def print_results(results):
+    """One line per measurement: count, p50/p95/p99 and throughput"""
+    print(f"{'measurement':<44} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'/s':>9}")
+    for name, summary in results.items():
+        if not isinstance(summary, dict) or 'p50_ms' not in summary:
+            print(f"{name:<44} {summary}")
+            continue
+        print(f"{name:<44} {summary['count']:>6} {summary['p50_ms']:>10.2f} "
+              f"{summary['p95_ms']:>10.2f} {summary['p99_ms']:>10.2f} "
+              f"{summary.get('per_second', ''):>9}")
+
+def compare_results(results, baseline_path, tolerance=0.10):
+    """Print p50/p95 changes against a saved run; returns names that got slower than tolerance"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    slower = []
+    print(f"\nCompared with {baseline_path}:")
+    for name, summary in results.items():
+        before = baseline.get(name)
+        if not isinstance(summary, dict) or not isinstance(before, dict) or 'p50_ms' not in summary:
+            continue
+        changes = []
+        for key in ('p50_ms', 'p95_ms'):
+            if before[key]:
+                change = (summary[key] - before[key]) / before[key]
+                changes.append(f"{key[:3]} {change:+.0%}")
+                if change > tolerance and key == 'p95_ms':
+                    slower.append(name)
+        print(f"  {name:<42} {', '.join(changes)}")
+    if slower:
+        print(f"Slower than baseline by more than {tolerance:.0%} (p95): {', '.join(slower)}")
+    return slower
@@ -0,0 +1,200 @@
+"""
+Fake Telegram Bot API server for offline benchmarks
+Answers the methods the bot and the admin panel use (getMe, sendMessage,
+sendDocument, getFile, ...) and serves synthetic PDFs under /file/bot<token>/.
+Replies are recorded per chat so a driver can wait for the bot's answers.
+
+    python benchmarks/fake_bot_api.py --port 8081
+    BOT_API_BASE_URL=http://127.0.0.1:8081 python admin_panel.py
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, defaultdict
+
+import tornado.httpserver
+import tornado.netutil
+import tornado.web
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Size of the synthetic PDFs served for getFile paths
+FAKE_PDF_SIZE = 200 * 1024
+
+BOT_USER = {'id': 1, 'is_bot': True, 'first_name': 'DMTT', 'username': 'dmtt_bench_bot'}
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def synthetic_pdf(size):
+    """A valid one-page PDF with a line of text, padded to about `size` bytes"""
+    text = b"BT /F1 14 Tf 72 720 Td (DMTT direktori lavozimiga ariza) Tj ET"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(text), text),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    # Padding as comment lines, so the file size matches real uploads
+    while len(pdf) < size - 300:
+        pdf += b"%" + b"0" * min(size - 300 - len(pdf), 1023) + b"\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return pdf
+
+# ============================================================================
+# FAKE BOT API
+# ============================================================================
+
+class FakeBotApi:
+    """
+    In-process Bot API stand-in on the running asyncio loop (tornado).
+    api_delay / file_delay (seconds) simulate Telegram round-trip times.
+    """
+
+    def __init__(self, api_delay=0.0, file_delay=0.0):
+        self.api_delay = api_delay
+        self.file_delay = file_delay
+        self.calls = Counter()
+        self.replies = defaultdict(list)
+        self._waiters = defaultdict(list)
+        self._message_id = 0
+        self._pdf = synthetic_pdf(FAKE_PDF_SIZE)
+        self.server = None
+
+    def application(self):
+        api = self
+
+        class MethodHandler(tornado.web.RequestHandler):
+            async def post(self, token, method):
+                await api.handle(self, method)
+
+            get = post
+
+        class FileHandler(tornado.web.RequestHandler):
+            async def get(self, token, path):
+                api.calls['file'] += 1
+                if api.file_delay:
+                    await asyncio.sleep(api.file_delay)
+                self.set_header('Content-Type', 'application/pdf')
+                self.write(api._pdf)
+
+        return tornado.web.Application([
+            (r'/file/bot([^/]+)/(.+)', FileHandler),
+            (r'/bot([^/]+)/(\w+)', MethodHandler),
+        ])
+
+    def start(self, port=0, address='127.0.0.1'):
+        """Listen on the current loop; returns the base URL (for BOT_API_BASE_URL)"""
+        sockets = tornado.netutil.bind_sockets(port, address)
+        self.server = tornado.httpserver.HTTPServer(self.application())
+        self.server.add_sockets(sockets)
+        return f"http://{address}:{sockets[0].getsockname()[1]}"
+
+    def stop(self):
+        if self.server:
+            self.server.stop()
+
+    @staticmethod
+    def _params(handler):
+        """Request parameters: JSON body, or form fields (JSON-encoded values)"""
+        if handler.request.headers.get('Content-Type', '').startswith('application/json'):
+            return json.loads(handler.request.body or b'{}')
+        params = {}
+        for name, values in handler.request.body_arguments.items():
+            value = values[0].decode()
+            try:
+                params[name] = json.loads(value)
+            except ValueError:
+                params[name] = value
+        for name, values in handler.request.query_arguments.items():
+            params.setdefault(name, values[0].decode())
+        return params
+
+    def _message(self, chat_id, **fields):
+        self._message_id += 1
+        return {'message_id': self._message_id, 'date': int(time.time()),
+                'chat': {'id': chat_id, 'type': 'private'}, **fields}
+
+    async def handle(self, handler, method):
+        self.calls[method] += 1
+        if self.api_delay:
+            await asyncio.sleep(self.api_delay)
+        params = self._params(handler)
+
+        if method == 'getMe':
+            result = BOT_USER
+        elif method == 'sendMessage':
+            chat_id = int(params['chat_id'])
+            result = self._message(chat_id, text=params.get('text', ''))
+            self._record(chat_id, params.get('text', ''))
+        elif method == 'sendDocument':
+            chat_id = int(params['chat_id'])
+            file_id = params.get('document', 'F')
+            result = self._message(chat_id, caption=params.get('caption', ''), document={
+                'file_id': file_id, 'file_unique_id': f"u{file_id}", 'file_name': 'ariza.pdf'
+            })
+        elif method == 'getFile':
+            file_id = params['file_id']
+            result = {'file_id': file_id, 'file_unique_id': f"u{file_id}",
+                      'file_size': FAKE_PDF_SIZE, 'file_path': f"documents/{file_id}.pdf"}
+        elif method == 'getUpdates':
+            # Long polling with nothing to deliver
+            await asyncio.sleep(min(float(params.get('timeout', 0) or 0), 1))
+            result = []
+        else:
+            result = True
+
+        handler.set_header('Content-Type', 'application/json')
+        handler.write(json.dumps({'ok': True, 'result': result}))
+
+    def _record(self, chat_id, text):
+        replies = self.replies[chat_id]
+        replies.append(text)
+        waiting = self._waiters[chat_id]
+        for count, future in list(waiting):
+            if len(replies) >= count and not future.done():
+                future.set_result(None)
+                waiting.remove((count, future))
+
+    async def wait_replies(self, chat_id, count, timeout=60):
+        """Wait until the bot has sent `count` messages to chat_id in total"""
+        if len(self.replies[chat_id]) >= count:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[chat_id].append((count, future))
+        await asyncio.wait_for(future, timeout)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+async def serve(port, api_delay, file_delay):
+    api = FakeBotApi(api_delay=api_delay, file_delay=file_delay)
+    print(f"Fake Bot API on {api.start(port)}")
+    await asyncio.Event().wait()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--api-delay', type=float, default=0.0, help="seconds per API call")
+    parser.add_argument('--file-delay', type=float, default=0.0, help="seconds per file download")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.port, args.api_delay, args.file_delay))
+    except KeyboardInterrupt:
+        pass
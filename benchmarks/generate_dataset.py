@@ -0,0 +1,104 @@
+"""
+Synthetic applications.csv generator for the DMTT benchmarks
+Realistic names, phones and usernames spread over a five-day intake window,
+with a share of repeat applicants (same chat or phone).
+
+    python benchmarks/generate_dataset.py 10000 -o applications.csv
+    python benchmarks/generate_dataset.py --standard      # 1k, 10k, 100k in benchmarks/data/
+"""
+
+import argparse
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+
+import common
+from storage import CSV_HEADERS
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+STANDARD_SIZES = (1000, 10000, 100000)
+DATA_DIR = os.path.join(common.BENCH_DIR, 'data')
+
+FIRST_NAMES = [
+    'Aziz', 'Bobur', 'Dilnoza', 'Gulnora', 'Jasur', 'Kamola', 'Laylo', 'Madina',
+    'Nodir', 'Oybek', 'Rustam', 'Sardor', 'Shahnoza', 'Temur', 'Umida', 'Zarina',
+    "O'tkir", "G'ayrat", 'Нодира', 'Шерзод',
+]
+LAST_NAMES = [
+    'Abdullayev', 'Karimova', 'Rahimov', 'Tursunova', 'Yusupov', 'Xolmatova',
+    'Ergashev', 'Qodirova', 'Mirzayev', 'Saidova', "To'xtayev", 'Юсупова',
+]
+OPERATOR_CODES = ['90', '91', '93', '94', '95', '97', '98', '99', '33', '88']
+
+# Share of applications from someone who already applied
+REPEAT_SHARE = 0.05
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def generate_rows(count, seed=1, start=datetime(2025, 12, 9), days=5):
+    """Rows in CSV_HEADERS order, oldest first, with busier daytime hours"""
+    rng = random.Random(seed)
+    # Any day of the window, mostly during office hours (around 13:00)
+    moments = sorted(
+        rng.randrange(days) * 86400 + min(max(rng.gauss(13, 3), 0), 23.99) * 3600
+        for _ in range(count)
+    )
+    applicants = []
+    rows = []
+    for index, offset in enumerate(moments, 1):
+        if applicants and rng.random() < REPEAT_SHARE:
+            name, phone, username, chat_id = rng.choice(applicants)
+        else:
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            phone = f"+998{rng.choice(OPERATOR_CODES)}{rng.randint(0, 9999999):07d}"
+            username = f"@user{index}" if rng.random() < 0.7 else 'N/A'
+            chat_id = str(100000000 + index)
+            applicants.append((name, phone, username, chat_id))
+        date = (start + timedelta(seconds=offset)).strftime('%Y-%m-%d %H:%M:%S')
+        file_id = f"BQACAgIAAxkBAAI{index:010d}"
+        rows.append([date, name, phone, username, chat_id, file_id,
+                     f"ariza_{index}.pdf", f"AgAD{index:08d}", ''])
+    return rows
+
+def write_dataset(path, count, seed=1):
+    """Write a synthetic applications CSV with `count` rows"""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADERS)
+        writer.writerows(generate_rows(count, seed))
+    return path
+
+def standard_dataset(count):
+    """Path of the standard dataset of this size, generated on first use"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"applications-{count}.csv")
+    if not os.path.exists(path):
+        write_dataset(path, count)
+    return path
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('rows', type=int, nargs='?', help="number of applications")
+    parser.add_argument('-o', '--output', default='applications.csv')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--standard', action='store_true',
+                        help="write the 1k/10k/100k datasets to benchmarks/data/")
+    args = parser.parse_args()
+
+    if args.standard:
+        for size in STANDARD_SIZES:
+            print(standard_dataset(size))
+    elif args.rows:
+        print(write_dataset(args.output, args.rows, args.seed))
+    else:
+        parser.error("give a number of rows or --standard")
@@ -4,29 +4,51 @@ Language: Uzbek
 Framework: python-telegram-bot v20+
 
 This bot collects applications with name, phone, and PDF document,
-saves to CSV, and forwards to admin.
+saves to CSV (through a batching writer), and forwards to admin.
+Several campaigns can run at once (see campaigns.py); applicants pick one
+with the deep link t.me/<bot>?start=<campaign>.
 """
 
+import time
+
+# Process startup, for the startup time logged by main()
+STARTUP_STARTED = time.perf_counter()
+
 import os
-import csv
 import re
+import asyncio
 import logging
 from datetime import datetime
 from pathlib import Path
 from telegram import Update
 from telegram.ext import (
     Application,
+    BaseUpdateProcessor,
     CommandHandler,
     MessageHandler,
     ConversationHandler,
+    TypeHandler,
     filters,
     ContextTypes,
 )
+from prometheus_client import start_http_server
 
 # Load environment variables from .env file
 from dotenv import load_dotenv
 load_dotenv()
 
+from storage import STORAGE_BACKEND, get_store
+from campaigns import load_campaigns
+from notifier import AdminNotifier
+from writer import ApplicationWriter
+from pdf_checker import PDF_CHECK, PDF_CHECK_FILE, PdfChecker
+from text_index import TEXT_INDEX_FILE, PdfTextIndex
+from rate_limit import RATE_LIMIT, RateLimiter
+from persistence import PERSISTENCE_FILE, SqlitePersistence
+from duplicates import DUPLICATE_POLICY, DUPLICATE_POLICIES, DuplicateIndex
+import metrics
+from metrics import timed_handler
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -57,8 +79,109 @@ except ValueError:
     print(f"Current value: {ADMIN_CHAT_ID_STR}")
     exit(1)
 
-# CSV file to store applications
-CSV_FILE = "applications.csv"
+# Longest full name accepted (it goes into the admins' notification)
+NAME_MAX_LENGTH = 100
+
+# Update processing: 1 = one update at a time; N > 1 = up to N updates
+# concurrently (still in order per user, see PerUserUpdateProcessor)
+CONCURRENT_UPDATES = int(os.getenv("CONCURRENT_UPDATES", "1"))
+
+# Updates in flight at once, including those waiting for the same user's
+# earlier updates (only CONCURRENT_UPDATES of them run)
+MAX_PENDING_UPDATES = 10000
+
+# HTTP connection pool and timeouts (seconds) for the bot's API requests
+BOT_POOL_SIZE = int(os.getenv("BOT_POOL_SIZE", "256"))
+BOT_POOL_TIMEOUT = float(os.getenv("BOT_POOL_TIMEOUT", "10"))
+BOT_CONNECT_TIMEOUT = float(os.getenv("BOT_CONNECT_TIMEOUT", "10"))
+BOT_READ_TIMEOUT = float(os.getenv("BOT_READ_TIMEOUT", "15"))
+BOT_WRITE_TIMEOUT = float(os.getenv("BOT_WRITE_TIMEOUT", "30"))
+
+# Only message updates are handled (commands, text and documents)
+ALLOWED_UPDATES = [Update.MESSAGE]
+
+# How updates arrive: "polling" (default) or "webhook"
+BOT_MODE = os.getenv("BOT_MODE", "polling").lower()
+
+# Webhook mode: public HTTPS base URL Telegram posts to, and the local server
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "").rstrip('/')
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "telegram").strip('/')
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", os.getenv("PORT", "8443")))
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "40"))
+
+# Alternative Bot API server (e.g. a local stand-in for testing)
+BOT_API_BASE_URL = os.getenv("BOT_API_BASE_URL", "").rstrip('/')
+
+if BOT_MODE not in ("polling", "webhook"):
+    print(f"❌ ERROR: BOT_MODE must be 'polling' or 'webhook' (got '{BOT_MODE}')")
+    exit(1)
+
+if BOT_MODE == "webhook":
+    if not WEBHOOK_URL:
+        print("❌ ERROR: WEBHOOK_URL must be set in webhook mode!")
+        print("Example: WEBHOOK_URL=https://dmtt-bot.onrender.com")
+        exit(1)
+    # Telegram sends it back in X-Telegram-Bot-Api-Secret-Token on every update
+    if not re.fullmatch(r'[A-Za-z0-9_-]{1,256}', WEBHOOK_SECRET):
+        print("❌ ERROR: WEBHOOK_SECRET must be set in webhook mode!")
+        print("Use 1-256 characters: letters, digits, '_' and '-'")
+        exit(1)
+
+if DUPLICATE_POLICY not in DUPLICATE_POLICIES:
+    print(f"❌ ERROR: DUPLICATE_POLICY must be one of: {', '.join(DUPLICATE_POLICIES)}")
+    exit(1)
+
+# Campaigns by slug (a single always open "default" one without CAMPAIGNS_FILE)
+try:
+    CAMPAIGNS = load_campaigns()
+except ValueError as e:
+    print(f"❌ ERROR: {e}")
+    exit(1)
+
+# ============================================================================
+# CAMPAIGN PIPELINES
+# ============================================================================
+
+class CampaignIntake:
+    """
+    One campaign's application pipeline; nothing in it reads or writes
+    another campaign's files
+    """
+
+    def __init__(self, campaign):
+        self.campaign = campaign
+
+        # Application storage (csv or sqlite, selected by STORAGE_BACKEND)
+        self.store = get_store(campaign=campaign)
+
+        # Earlier applications by chat ID / phone / PDF, loaded now and kept current on every save
+        self.duplicate_index = DuplicateIndex()
+        self.store.subscribe(self.duplicate_index)
+
+        # Applications are group-committed by one writer task (durable before the reply)
+        self.writer = ApplicationWriter(self.store)
+
+        # Submitted PDFs are downloaded and checked in the background (in the
+        # process pool all campaigns share), and their text is added to the
+        # campaign's full-text index
+        self.pdf_checker = PdfChecker(
+            self.store, path=campaign.path(PDF_CHECK_FILE),
+            text_index=PdfTextIndex(campaign.path(TEXT_INDEX_FILE))
+        )
+
+    def admins(self):
+        """Chat IDs notified of this campaign's applications"""
+        return self.campaign.admins or ADMIN_CHAT_IDS
+
+intakes = {slug: CampaignIntake(campaign) for slug, campaign in CAMPAIGNS.items()}
+
+# Admin notifications are delivered from a persisted background queue
+notifier = AdminNotifier()
+
+# Flood protection: per-chat and global token buckets ahead of the conversation
+rate_limiter = RateLimiter()
 
 # Conversation states
 WAITING_NAME, WAITING_PHONE, WAITING_PDF = range(3)
@@ -100,40 +223,105 @@ def normalize_phone(phone: str) -> str:
     return cleaned
 
 def init_csv():
-    """Initialize CSV file with headers if it doesn't exist"""
-    if not os.path.exists(CSV_FILE):
-        with open(CSV_FILE, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                'Sana', 'Ism', 'Telefon', 'Username', 
-                'Chat ID', 'File ID', 'Fayl nomi'
-            ])
-        logger.info(f"CSV file created: {CSV_FILE}")
-
-def save_to_csv(data: dict):
-    """Save application data to CSV file"""
+    """Initialize every campaign's application storage if it doesn't exist"""
+    for intake in intakes.values():
+        if intake.store.init():
+            logger.info(f"Storage created: {intake.store.path} ({STORAGE_BACKEND})")
+
+async def save_to_csv(intake: CampaignIntake, data: dict):
+    """Save application data to the campaign's storage backend; True once it is on disk"""
     try:
-        with open(CSV_FILE, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow([
-                data['date'],
-                data['name'],
-                data['phone'],
-                data['username'],
-                data['chat_id'],
-                data['file_id'],
-                data['file_name']
-            ])
+        with metrics.STORAGE_WRITE_SECONDS.time():
+            await intake.writer.submit(data)
         logger.info(f"Data saved for user: {data['name']}")
         return True
     except Exception as e:
-        logger.error(f"Error saving to CSV: {e}")
+        metrics.STORAGE_WRITE_FAILURES.inc()
+        logger.error(f"Error saving application: {e}")
         return False
 
+def current_intake(user_data: dict):
+    """
+    The campaign chosen with /start, or None if it is no longer configured.
+    Conversations begun before campaigns existed belong to the only
+    campaign, if there is just one.
+    """
+    slug = user_data.get('campaign')
+    if slug is None and len(intakes) == 1:
+        return next(iter(intakes.values()))
+    return intakes.get(slug)
+
+def campaign_links(bot_username: str) -> str:
+    """Deep links to the campaigns open right now, one per line"""
+    return "\n".join(
+        f"• {campaign.title}: https://t.me/{bot_username}?start={campaign.slug}"
+        for campaign in CAMPAIGNS.values() if campaign.is_open()
+    )
+
+def count_abandoned(user_data: dict):
+    """Count an unfinished conversation being dropped, by the step it was waiting for"""
+    stage = user_data.get('stage')
+    if stage:
+        metrics.CONVERSATIONS_ABANDONED.labels(stage).inc()
+
+# ============================================================================
+# UPDATE PROCESSING
+# ============================================================================
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processes updates from different users concurrently while each user's
+    updates still run one at a time, in order. The ConversationHandler
+    state (name -> phone -> PDF) therefore stays consistent per user.
+
+    A running slot is only taken once the user's lock is held, so updates
+    queued behind the same user never keep other users waiting. The base
+    class's own limit just bounds the updates in flight.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max(max_concurrent_updates, MAX_PENDING_UPDATES))
+        self._running = asyncio.Semaphore(max_concurrent_updates)
+        # (chat_id, user_id) -> [lock, number of updates holding or waiting]
+        self._locks = {}
+
+    @staticmethod
+    def _key(update: object):
+        if not isinstance(update, Update):
+            return None
+        chat = update.effective_chat
+        user = update.effective_user
+        return (chat.id if chat else None, user.id if user else None)
+
+    async def do_process_update(self, update, coroutine) -> None:
+        key = self._key(update)
+        if key is None:
+            async with self._running:
+                await coroutine
+            return
+
+        entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0], self._running:
+                await coroutine
+        finally:
+            entry[1] -= 1
+            # Idle users don't keep a lock around
+            if entry[1] == 0:
+                del self._locks[key]
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
 # ============================================================================
 # CONVERSATION HANDLERS
 # ============================================================================
 
+@timed_handler('start')
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Start command handler - begins the application process
@@ -142,13 +330,50 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     logger.info(f"User {user.id} (@{user.username}) started the bot")
     
     # Clear any existing data
+    count_abandoned(context.user_data)
     context.user_data.clear()
     
+    # Campaign from the deep link (/start <campaign>); without one, the only
+    # campaign, or the only open one
+    slug = context.args[0] if context.args else None
+    if slug:
+        campaign = CAMPAIGNS.get(slug)
+    elif len(CAMPAIGNS) == 1:
+        campaign = next(iter(CAMPAIGNS.values()))
+    else:
+        open_campaigns = [campaign for campaign in CAMPAIGNS.values() if campaign.is_open()]
+        campaign = open_campaigns[0] if len(open_campaigns) == 1 else None
+    
+    if campaign is None:
+        links = campaign_links(context.bot.username)
+        if slug:
+            message = "❌ Bunday tanlov topilmadi."
+        elif links:
+            message = "Qaysi tanlovga ariza topshirmoqchisiz?"
+        else:
+            message = "ℹ️ Hozirda ariza qabul qilinayotgan tanlov yo'q."
+        if links:
+            message += "\n\nOchiq tanlovlar:\n" + links
+        await update.message.reply_text(message)
+        return ConversationHandler.END
+    
+    status = campaign.status()
+    if status != 'open':
+        logger.info(f"User {user.id} tried {status} campaign {campaign.slug}")
+        if status == 'upcoming':
+            message = f"ℹ️ Ariza qabul qilish {campaign.opens:%Y-%m-%d %H:%M} da boshlanadi."
+        else:
+            message = "ℹ️ Ushbu tanlov bo'yicha ariza qabul qilish yakunlangan."
+        await update.message.reply_text(message)
+        return ConversationHandler.END
+    
+    context.user_data['campaign'] = campaign.slug
+    context.user_data['stage'] = 'name'
+    metrics.CONVERSATIONS_STARTED.inc()
+    
     # Send welcome message
     welcome_message = (
-        "Farg'ona viloyati maktabgacha va maktab ta'limi boshqarmasi "
-        "bo'sh (vakant) DMTT direktori lavozimlariga ochiq tanlov e'lon qiladi.\n\n"
-        "Ariza qabul qilish 2025-yil 9-dekabrdan 13-dekabrgacha davom etadi.\n\n"
+        f"{campaign.welcome}\n\n"
         "Iltimos, arizani topshirish uchun quyidagi ma'lumotlarni kiriting."
     )
     
@@ -157,6 +382,7 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     
     return WAITING_NAME
 
+@timed_handler('receive_name')
 async def receive_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Receive and validate user's full name
@@ -169,9 +395,15 @@ async def receive_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
             "Iltimos, to'liq ismingizni kiriting (kamida 3 ta harf):"
         )
         return WAITING_NAME
+    if len(name) > NAME_MAX_LENGTH:
+        await update.message.reply_text(
+            f"Ism juda uzun. Iltimos, ism va familiyangizni kiriting (ko'pi bilan {NAME_MAX_LENGTH} ta belgi):"
+        )
+        return WAITING_NAME
     
     # Save name
     context.user_data['name'] = name
+    context.user_data['stage'] = 'phone'
     logger.info(f"Name received: {name}")
     
     # Ask for phone number
@@ -181,6 +413,7 @@ async def receive_name(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     
     return WAITING_PHONE
 
+@timed_handler('receive_phone')
 async def receive_phone(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Receive and validate phone number
@@ -202,6 +435,7 @@ async def receive_phone(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     # Normalize and save phone
     normalized_phone = normalize_phone(phone)
     context.user_data['phone'] = normalized_phone
+    context.user_data['stage'] = 'pdf'
     logger.info(f"Phone received: {normalized_phone}")
     
     # Ask for PDF document
@@ -212,6 +446,7 @@ async def receive_phone(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     
     return WAITING_PDF
 
+@timed_handler('receive_pdf')
 async def receive_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Receive and process PDF document
@@ -243,6 +478,46 @@ async def receive_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
         return WAITING_PDF
     
     user = update.effective_user
+    intake = current_intake(context.user_data)
+    
+    # The conversation's campaign was removed from the configuration meanwhile
+    if intake is None:
+        logger.warning(f"User {user.id} applied to unknown campaign {context.user_data.get('campaign')!r}")
+        message = "❌ Bu tanlov endi mavjud emas, arizangiz saqlanmadi."
+        links = campaign_links(context.bot.username)
+        if links:
+            message += "\n\nOchiq tanlovlar:\n" + links
+        else:
+            message += "\n\nHozirda ariza qabul qilinayotgan tanlov yo'q."
+        await update.message.reply_text(message)
+        count_abandoned(context.user_data)
+        context.user_data.clear()
+        return ConversationHandler.END
+    
+    # The campaign may have closed while the applicant was typing
+    if not intake.campaign.is_open():
+        await update.message.reply_text(
+            "ℹ️ Ushbu tanlov bo'yicha ariza qabul qilish yakunlangan."
+        )
+        metrics.CONVERSATIONS_COMPLETED.labels('closed').inc()
+        context.user_data.clear()
+        return ConversationHandler.END
+    
+    # Has this applicant (chat, phone or the same PDF) applied to this campaign before?
+    intake.store.refresh()
+    previous_id = intake.duplicate_index.find(
+        user.id, context.user_data['phone'], document.file_unique_id
+    )
+    
+    if previous_id and DUPLICATE_POLICY == 'reject':
+        logger.info(f"Duplicate application rejected for user {user.id} (previous: {previous_id})")
+        await update.message.reply_text(
+            f"ℹ️ Siz avval ariza topshirgansiz (№{previous_id}).\n\n"
+            "Qayta ariza qabul qilinmaydi."
+        )
+        metrics.CONVERSATIONS_COMPLETED.labels('rejected').inc()
+        context.user_data.clear()
+        return ConversationHandler.END
     
     # Prepare data for saving
     application_data = {
@@ -252,55 +527,44 @@ async def receive_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
         'username': f"@{user.username}" if user.username else "N/A",
         'chat_id': user.id,
         'file_id': document.file_id,
-        'file_name': document.file_name
+        'file_name': document.file_name,
+        'file_unique_id': document.file_unique_id,
+        'previous_id': previous_id or ''
     }
     
-    # Save to CSV
-    if not save_to_csv(application_data):
+    # Save to storage
+    if not await save_to_csv(intake, application_data):
+        metrics.CONVERSATIONS_COMPLETED.labels('failed').inc()
         await update.message.reply_text(
             "❌ Xatolik yuz berdi. Iltimos, qaytadan urinib ko'ring.\n\n"
             "Botni qayta boshlash uchun /start buyrug'ini yuboring."
         )
         return ConversationHandler.END
     
+    metrics.CONVERSATIONS_COMPLETED.labels('saved').inc()
+    
     # Send confirmation to user
-    await update.message.reply_text(
-        "✅ Arizangiz qabul qilindi. Rahmat!"
-    )
+    confirmation = "✅ Arizangiz qabul qilindi. Rahmat!"
+    if previous_id and DUPLICATE_POLICY == 'replace':
+        confirmation += f"\n\nOldingi arizangiz (№{previous_id}) yangisi bilan almashtirildi."
+    await update.message.reply_text(confirmation)
     
-    # Forward to admin
+    # Queue notification for admins (delivered in the background)
     try:
         admin_message = (
             "📋 Yangi ariza kelib tushdi:\n\n"
+            f"🏷 Tanlov: {intake.campaign.title}\n"
             f"👤 Ism: {application_data['name']}\n"
             f"📱 Telefon: {application_data['phone']}\n"
             f"🆔 Username: {application_data['username']}\n"
-            f"📅 Sana: {application_data['date']}\n\n"
-            "📄 PDF fayl quyida:"
+            f"📅 Sana: {application_data['date']}"
         )
-        
-        # Send to all admins
-        for admin_id in ADMIN_CHAT_IDS:
-            try:
-                await context.bot.send_message(
-                    chat_id=admin_id,
-                    text=admin_message
-                )
-                
-                await context.bot.send_document(
-                    chat_id=admin_id,
-                    document=document.file_id,
-                    caption=f"Ariza: {application_data['name']}"
-                )
-                
-                logger.info(f"Application forwarded to admin {admin_id} for user: {application_data['name']}")
-            except Exception as e:
-                logger.error(f"Error forwarding to admin {admin_id}: {e}")
-        
-
-        
+        if previous_id:
+            admin_message += f"\n\n🔁 Qayta topshirilgan (avvalgi ariza: №{previous_id})"
+        await notifier.enqueue(intake.admins(), document.file_id, admin_message)
+        logger.info(f"Admin notification queued for user: {application_data['name']}")
     except Exception as e:
-        logger.error(f"Error forwarding to admin: {e}")
+        logger.error(f"Error queueing admin notification: {e}")
         # Don't inform user about admin notification failure
     
     # Clear user data
@@ -308,10 +572,20 @@ async def receive_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     
     return ConversationHandler.END
 
+async def receive_text_instead_of_pdf(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+    """
+    Remind the user that a PDF is expected; stays in WAITING_PDF
+    """
+    await update.message.reply_text(
+        "❌ Iltimos, PDF fayl yuboring (matn emas)."
+    )
+    return WAITING_PDF
+
 async def cancel(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
     Cancel the conversation
     """
+    count_abandoned(context.user_data)
     context.user_data.clear()
     await update.message.reply_text(
         "❌ Ariza bekor qilindi.\n\n"
@@ -338,19 +612,59 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
             "Botni qayta boshlash uchun /start buyrug'ini yuboring."
         )
 
+async def post_init(application: Application) -> None:
+    """
+    Start every campaign's background writer and PDF checks, and the admin notifier
+    """
+    for intake in intakes.values():
+        await intake.writer.start(application)
+    await notifier.start(application)
+    if PDF_CHECK:
+        for intake in intakes.values():
+            await intake.pdf_checker.start(application)
+
+async def post_stop(application: Application) -> None:
+    """
+    Stop the PDF checks and admin notifier and commit any queued applications
+    """
+    for intake in intakes.values():
+        await intake.pdf_checker.stop(application)
+    await notifier.stop(application)
+    for intake in intakes.values():
+        await intake.writer.stop(application)
+
 # ============================================================================
 # MAIN FUNCTION
 # ============================================================================
 
-def main():
+def build_application() -> Application:
     """
-    Main function to run the bot
+    Create the Application with its HTTP settings, persistence and handlers
     """
-    # Initialize CSV file
-    init_csv()
-    
     # Create application
-    application = Application.builder().token(BOT_TOKEN).build()
+    builder = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .connection_pool_size(BOT_POOL_SIZE)
+        .pool_timeout(BOT_POOL_TIMEOUT)
+        .connect_timeout(BOT_CONNECT_TIMEOUT)
+        .read_timeout(BOT_READ_TIMEOUT)
+        .write_timeout(BOT_WRITE_TIMEOUT)
+        .post_init(post_init)
+        .post_stop(post_stop)
+    )
+    if CONCURRENT_UPDATES > 1:
+        builder = builder.concurrent_updates(PerUserUpdateProcessor(CONCURRENT_UPDATES))
+    if PERSISTENCE_FILE:
+        # Conversation state and user_data survive restarts
+        builder = builder.persistence(SqlitePersistence(PERSISTENCE_FILE))
+    if BOT_API_BASE_URL:
+        builder = (
+            builder
+            .base_url(f"{BOT_API_BASE_URL}/bot")
+            .base_file_url(f"{BOT_API_BASE_URL}/file/bot")
+        )
+    application = builder.build()
     
     # Define conversation handler
     conv_handler = ConversationHandler(
@@ -367,10 +681,7 @@ def main():
             ],
             WAITING_PDF: [
                 MessageHandler(filters.Document.ALL, receive_pdf),
-                MessageHandler(filters.TEXT & ~filters.COMMAND, 
-                             lambda u, c: u.message.reply_text(
-                                 "❌ Iltimos, PDF fayl yuboring (matn emas)."
-                             ))
+                MessageHandler(filters.TEXT & ~filters.COMMAND, receive_text_instead_of_pdf)
             ],
         },
         fallbacks=[
@@ -378,18 +689,52 @@ def main():
             CommandHandler('start', start),
             CommandHandler('restart', restart)
         ],
-        allow_reentry=True
+        allow_reentry=True,
+        name='application',
+        persistent=bool(PERSISTENCE_FILE)
     )
     
-    # Add handlers
+    # Add handlers (the rate limiter runs first and stops excess updates)
+    if RATE_LIMIT:
+        application.add_handler(TypeHandler(Update, rate_limiter.check), group=-1)
     application.add_handler(conv_handler)
     application.add_error_handler(error_handler)
     
+    return application
+
+def main():
+    """
+    Main function to run the bot
+    """
+    # Initialize CSV file
+    init_csv()
+    
+    application = build_application()
+    logger.info(f"Startup took {time.perf_counter() - STARTUP_STARTED:.2f}s "
+                f"(imports, configuration and {len(intakes)} campaign(s) loaded)")
+    
+    if metrics.METRICS_PORT:
+        start_http_server(metrics.METRICS_PORT, addr=metrics.METRICS_ADDR,
+                          registry=metrics.bot_registry)
+        logger.info(f"Metrics on http://{metrics.METRICS_ADDR}:{metrics.METRICS_PORT}/metrics")
+    
     # Start the bot
     logger.info("Bot started successfully!")
     print("✅ Bot ishga tushdi! To'xtatish uchun Ctrl+C bosing.")
     
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    if BOT_MODE == "webhook":
+        logger.info(f"Webhook server on {WEBHOOK_LISTEN}:{WEBHOOK_PORT}/{WEBHOOK_PATH}")
+        application.run_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=f"{WEBHOOK_URL}/{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET,
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+            allowed_updates=ALLOWED_UPDATES,
+        )
+    else:
+        application.run_polling(allowed_updates=ALLOWED_UPDATES)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,150 @@
+"""
+Campaigns (competitions) for DMTT Application Bot
+One bot and one admin panel can run several intakes at once. Each campaign
+is defined in CAMPAIGNS_FILE (JSON), keyed by its slug:
+
+    {
+        "fargona-2025": {
+            "title": "Farg'ona viloyati, 2025-yil dekabr",
+            "welcome": "Farg'ona viloyati ... ochiq tanlov e'lon qiladi.",
+            "opens": "2025-12-09",
+            "closes": "2025-12-13 18:00",
+            "admins": [123456789]
+        }
+    }
+
+Applicants join a campaign through its deep link (t.me/<bot>?start=<slug>).
+Every campaign keeps its data (applications, PDF checks, text index,
+prefetch status, reviews) in its own folder, CAMPAIGNS_FOLDER/<slug>/, so
+nothing that reads one campaign ever scans another. The PDF cache and the
+admin outbox are shared.
+
+Without CAMPAIGNS_FILE there is a single, always open "default" campaign
+using the original file names, so existing deployments keep their data.
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timedelta
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+CAMPAIGNS_FILE = os.getenv("CAMPAIGNS_FILE", "campaigns.json")
+CAMPAIGNS_FOLDER = os.getenv("CAMPAIGNS_FOLDER", "campaigns")
+
+DEFAULT_CAMPAIGN = "default"
+
+# Telegram allows these characters (up to 64) in a /start deep-link payload
+SLUG_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
+
+DATE_FORMATS = ('%Y-%m-%d %H:%M', '%Y-%m-%d')
+
+# Welcome text of the default campaign (configured ones without a welcome show their title)
+DEFAULT_WELCOME = (
+    "Farg'ona viloyati maktabgacha va maktab ta'limi boshqarmasi "
+    "bo'sh (vakant) DMTT direktori lavozimlariga ochiq tanlov e'lon qiladi.\n\n"
+    "Ariza qabul qilish 2025-yil 9-dekabrdan 13-dekabrgacha davom etadi."
+)
+
+CAMPAIGN_STATUSES = {
+    'upcoming': "Hali boshlanmagan",
+    'open': "Ochiq",
+    'closed': "Yakunlangan",
+}
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def parse_moment(value, end_of_day=False):
+    """
+    "YYYY-MM-DD HH:MM" or "YYYY-MM-DD" as a datetime; a bare date closing
+    a campaign means the end of that day. None stays None.
+    """
+    if not value:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            moment = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if fmt == '%Y-%m-%d' and end_of_day:
+            moment += timedelta(days=1)
+        return moment
+    raise ValueError(f"invalid date '{value}' (use YYYY-MM-DD or YYYY-MM-DD HH:MM)")
+
+# ============================================================================
+# CAMPAIGNS
+# ============================================================================
+
+class Campaign:
+    """One intake: its window, welcome text, admins and data folder"""
+
+    def __init__(self, slug, title='', welcome='', opens=None, closes=None, admins=(), folder=None):
+        self.slug = slug
+        self.title = title or slug
+        self.welcome = welcome or self.title
+        self.opens = opens
+        self.closes = closes
+        self.admins = list(admins)
+        # None: files in the working directory (the default campaign)
+        self.folder = folder
+
+    def __repr__(self):
+        return f"Campaign({self.slug!r})"
+
+    def path(self, filename):
+        """Where this campaign keeps one of its data files (e.g. CSV_FILE)"""
+        if self.folder is None:
+            return filename
+        os.makedirs(self.folder, exist_ok=True)
+        return os.path.join(self.folder, os.path.basename(filename))
+
+    def status(self, now=None):
+        """upcoming, open or closed"""
+        now = now or datetime.now()
+        if self.opens and now < self.opens:
+            return 'upcoming'
+        if self.closes and now >= self.closes:
+            return 'closed'
+        return 'open'
+
+    def is_open(self, now=None):
+        return self.status(now) == 'open'
+
+def load_campaigns(path=CAMPAIGNS_FILE, folder=CAMPAIGNS_FOLDER):
+    """
+    Campaigns from the config file by slug, in file order (the first one is
+    the admin panel's default). Raises ValueError on an invalid file.
+    """
+    if not path or not os.path.exists(path):
+        return {DEFAULT_CAMPAIGN: Campaign(DEFAULT_CAMPAIGN, welcome=DEFAULT_WELCOME)}
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{path}: {e}")
+    if not isinstance(config, dict) or not config:
+        raise ValueError(f"{path}: expected an object of campaigns by slug")
+
+    campaigns = {}
+    for slug, options in config.items():
+        if not SLUG_PATTERN.fullmatch(slug):
+            raise ValueError(f"{path}: campaign slug '{slug}' may only use A-Z, a-z, 0-9, _ and - (max 64)")
+        try:
+            campaigns[slug] = Campaign(
+                slug,
+                title=options.get('title', ''),
+                welcome=options.get('welcome', ''),
+                opens=parse_moment(options.get('opens')),
+                closes=parse_moment(options.get('closes'), end_of_day=True),
+                admins=[int(chat_id) for chat_id in options.get('admins', [])],
+                folder=os.path.join(folder, slug),
+            )
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"{path}: campaign '{slug}': {e}")
+    return campaigns
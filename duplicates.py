@@ -0,0 +1,115 @@
+"""
+Duplicate application detection for DMTT Application Bot
+In-memory index over Chat ID, normalized phone and PDF file_unique_id.
+
+Applications sharing any of these keys belong to the same applicant; the
+index answers "has this applicant applied before?" in O(1) and groups
+repeat applications for the admin panel's duplicates view.
+"""
+
+import os
+import re
+import threading
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# What happens when an applicant submits again:
+#   reject  - the new application is refused
+#   replace - it is saved and supersedes the earlier one(s)
+#   keep    - it is saved as a new version next to the earlier one(s)
+DUPLICATE_POLICY = os.getenv("DUPLICATE_POLICY", "keep").lower()
+DUPLICATE_POLICIES = ('reject', 'replace', 'keep')
+
+# Index keys: name -> application field
+KEY_FIELDS = {
+    'chat_id': 'Chat ID',
+    'phone': 'Telefon',
+    'file': 'File unique ID',
+}
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def application_keys(chat_id='', phone='', file_unique_id=''):
+    """Index keys for an applicant; empty values are skipped"""
+    values = {
+        'chat_id': str(chat_id).strip(),
+        'phone': re.sub(r'\D', '', str(phone)),
+        'file': str(file_unique_id).strip(),
+    }
+    return [(name, value) for name, value in values.items() if value]
+
+# ============================================================================
+# DUPLICATE INDEX
+# ============================================================================
+
+class DuplicateIndex:
+    """
+    Store listener (see storage.subscribe) keeping:
+    - key -> latest application id, for O(1) checks at submission time
+    - a union-find over ids, so every application sharing a key with
+      another ends up in the same group
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._latest = {}
+        self._parent = {}
+        self._apps = {}
+
+    def clear(self):
+        """Drop everything (the store was reloaded from scratch)"""
+        with self._lock:
+            self._reset()
+
+    def _root(self, app_id):
+        parent = self._parent
+        while parent[app_id] != app_id:
+            parent[app_id] = parent[parent[app_id]]
+            app_id = parent[app_id]
+        return app_id
+
+    def _union(self, a, b):
+        root_a, root_b = self._root(a), self._root(b)
+        if root_a != root_b:
+            # Keep the oldest application as the group root
+            self._parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def add(self, rows):
+        """Index newly stored applications"""
+        with self._lock:
+            for app in rows:
+                app_id = app['id']
+                self._apps[app_id] = app
+                self._parent[app_id] = app_id
+                keys = application_keys(app.get('Chat ID', ''), app.get('Telefon', ''),
+                                        app.get('File unique ID', ''))
+                for key in keys:
+                    earlier = self._latest.get(key)
+                    if earlier is not None:
+                        self._union(earlier, app_id)
+                    self._latest[key] = app_id
+
+    def find(self, chat_id='', phone='', file_unique_id=''):
+        """Id of the applicant's latest earlier application, or None"""
+        with self._lock:
+            matches = [self._latest[key]
+                       for key in application_keys(chat_id, phone, file_unique_id)
+                       if key in self._latest]
+            return max(matches) if matches else None
+
+    def groups(self):
+        """Groups of two or more applications from the same applicant, newest group first"""
+        with self._lock:
+            members = {}
+            for app_id in self._parent:
+                members.setdefault(self._root(app_id), []).append(app_id)
+            groups = [sorted(ids) for ids in members.values() if len(ids) > 1]
+            groups.sort(key=lambda ids: ids[-1], reverse=True)
+            return [[self._apps[app_id] for app_id in ids] for ids in groups]
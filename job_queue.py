@@ -0,0 +1,164 @@
+"""
+SQLite job queue for the DMTT background workers
+One job per application in a table of a small SQLite file, so several
+processes share the queue without doing the same job twice:
+
+    pending -> <active> -> <finished statuses>
+                        -> pending (retried with backoff) -> ... -> failed
+
+A job claimed by a process that died is claimed again once it has been
+active for `stale_after` seconds. prefetch.py and pdf_checker.py keep their
+job tables (schema and result columns) and run on this.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# A job claimed this long ago by a process that died is claimed again
+JOB_STALE_AFTER = 600
+
+JOB_MAX_BACKOFF = 600
+
+# ============================================================================
+# JOB QUEUE
+# ============================================================================
+
+class JobQueue:
+    """
+    Jobs in `table` (created by `schema`), keyed by app_id, with at least
+    the columns status, attempts, next_attempt, error and updated_at.
+    claim() returns (app_id, *columns, attempts) tuples, newest first.
+    One connection per thread.
+    """
+
+    def __init__(self, path, table, schema, columns, active, statuses,
+                 max_attempts, stale_after=JOB_STALE_AFTER, max_backoff=JOB_MAX_BACKOFF):
+        self.path = path
+        self.table = table
+        self.schema = schema
+        self.columns = tuple(columns)
+        self.active = active
+        self.statuses = statuses
+        self.max_attempts = max_attempts
+        self.stale_after = stale_after
+        self.max_backoff = max_backoff
+        self._local = threading.local()
+        self.connect()
+
+    def connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(self.schema)
+            self._local.conn = conn
+        return conn
+
+    def add(self, jobs):
+        """Queue (app_id, *columns) jobs; already known applications keep their status"""
+        names = ", ".join(('app_id',) + self.columns)
+        placeholders = ", ".join("?" for _ in range(len(self.columns) + 2))
+        now = time.time()
+        with self.connect() as conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO {self.table} ({names}, updated_at) VALUES ({placeholders})",
+                [tuple(job) + (now,) for job in jobs]
+            )
+
+    def select(self, columns, app_ids):
+        """Cursor over (app_id, *columns) of the given applications"""
+        app_ids = list(app_ids)
+        if not app_ids:
+            return []
+        placeholders = ", ".join("?" for _ in app_ids)
+        return self.connect().execute(
+            f"SELECT app_id, {', '.join(columns)} FROM {self.table} "
+            f"WHERE app_id IN ({placeholders})", app_ids
+        )
+
+    def progress(self):
+        """Number of jobs in each status"""
+        counts = dict.fromkeys(self.statuses, 0)
+        counts.update(self.connect().execute(
+            f"SELECT status, COUNT(*) FROM {self.table} GROUP BY status"
+        ))
+        return counts
+
+    def version(self):
+        """Token that changes whenever a job changes"""
+        return self.connect().execute(f"SELECT MAX(updated_at) FROM {self.table}").fetchone()[0] or 0
+
+    def claim(self, limit):
+        """Atomically take up to `limit` due jobs, newest applications first"""
+        now = time.time()
+        conn = self.connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            jobs = conn.execute(
+                f"SELECT app_id, {', '.join(self.columns)}, attempts FROM {self.table} "
+                "WHERE (status = 'pending' AND next_attempt <= ?) "
+                "OR (status = ? AND updated_at < ?) "
+                "ORDER BY app_id DESC LIMIT ?",
+                (now, self.active, now - self.stale_after, limit)
+            ).fetchall()
+            conn.executemany(
+                f"UPDATE {self.table} SET status = ?, updated_at = ? WHERE app_id = ?",
+                [(self.active, now, job[0]) for job in jobs]
+            )
+        return jobs
+
+    def finish(self, app_id, status, attempts=0, delay=0, **fields):
+        """Set a job's status (and result columns); it is due again after `delay` seconds"""
+        fields.setdefault('error', '')
+        assignments = "".join(f"{name} = ?, " for name in fields)
+        now = time.time()
+        with self.connect() as conn:
+            conn.execute(
+                f"UPDATE {self.table} SET status = ?, attempts = ?, next_attempt = ?, "
+                f"{assignments}updated_at = ? WHERE app_id = ?",
+                (status, attempts, now + delay, *fields.values(), now, app_id)
+            )
+
+    def retry(self, app_id, attempts, error):
+        """
+        Record a failed attempt: the job is pending again after a backoff, or
+        failed after max_attempts. Returns the backoff, or None if it failed.
+        """
+        attempts += 1
+        if attempts >= self.max_attempts:
+            self.finish(app_id, 'failed', attempts, error=error)
+            return None
+        backoff = min(5 * 2 ** attempts, self.max_backoff)
+        self.finish(app_id, 'pending', attempts, backoff, error=error)
+        return backoff
+
+    async def run(self, refresh, handle, concurrency, interval, report=print):
+        """
+        Forever: call refresh() in a thread (to pick up new applications),
+        claim due jobs and await handle(*job) for each, at most
+        `concurrency` at a time; sleep `interval` seconds when idle
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def limited(job):
+            async with semaphore:
+                await handle(*job)
+
+        while True:
+            try:
+                await asyncio.to_thread(refresh)
+                jobs = await asyncio.to_thread(self.claim, concurrency * 4)
+            except Exception as e:
+                report(f"Error checking for {self.table} jobs: {e}")
+                jobs = []
+
+            if jobs:
+                await asyncio.gather(*(limited(job) for job in jobs))
+            else:
+                await asyncio.sleep(interval)
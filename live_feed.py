@@ -0,0 +1,132 @@
+"""
+Live feed for the DMTT admin panel
+One watcher thread per process notices new applications (a stat() of
+applications.csv, or an indexed query on SQLite) and fans them out to every
+connected Server-Sent Events client. Idle clients just wait on a condition
+variable, so open dashboard tabs cost no CPU between applications.
+
+Each open stream does hold one of the server's request threads, though, so
+at most LIVE_FEED_MAX_STREAMS are open per process (across campaigns); the
+dashboards beyond that poll instead.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from werkzeug.wsgi import ClosingIterator
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# How often the watcher checks the store for appended applications (seconds)
+LIVE_FEED_INTERVAL = float(os.getenv("LIVE_FEED_INTERVAL", "1"))
+
+# Keep-alive comment for idle connections (seconds)
+LIVE_FEED_HEARTBEAT = 15
+
+# Events kept for clients reconnecting with Last-Event-ID
+LIVE_FEED_BACKLOG = 500
+
+# Open streams per process; keep it well below the server's request threads
+LIVE_FEED_MAX_STREAMS = int(os.getenv("LIVE_FEED_MAX_STREAMS", "8"))
+
+# Taken by every open stream (see LiveFeed.open_stream)
+stream_slots = threading.BoundedSemaphore(LIVE_FEED_MAX_STREAMS)
+
+# ============================================================================
+# LIVE FEED
+# ============================================================================
+
+class LiveFeed:
+    """
+    Store listener that turns new applications into numbered SSE events.
+
+        feed = LiveFeed(store, stats_fn=application_stats)
+        store.subscribe(feed)
+        stream = feed.open_stream(last_event_id)   # None: no slot free
+        return Response(stream, mimetype='text/event-stream')
+
+    stats_fn runs inside the store's listener loop, so it must not refresh
+    the store (a nested refresh would publish newer rows first).
+    """
+
+    def __init__(self, store, stats_fn, interval=LIVE_FEED_INTERVAL):
+        self.store = store
+        self.stats_fn = stats_fn
+        self.interval = interval
+        self._events = deque(maxlen=LIVE_FEED_BACKLOG)
+        self._seq = 0
+        self._ready = False
+        self._condition = threading.Condition()
+        self._watcher = None
+
+    def clear(self):
+        """The store was reloaded; old events no longer describe it"""
+        with self._condition:
+            self._events.clear()
+
+    def add(self, rows):
+        """Publish newly stored applications (rows seen at subscribe time are skipped)"""
+        if not self._ready:
+            return
+        stats = self.stats_fn()
+        with self._condition:
+            for app in rows:
+                self._seq += 1
+                self._events.append((self._seq, json.dumps(
+                    {'application': app, 'stats': stats}, ensure_ascii=False
+                )))
+            self._condition.notify_all()
+
+    def start(self):
+        """Start the watcher thread (once per process)"""
+        with self._condition:
+            self._ready = True
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, daemon=True)
+                self._watcher.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.store.refresh()
+            except Exception as e:
+                print(f"Error watching applications: {e}")
+
+    def open_stream(self, last_event_id=None):
+        """
+        SSE messages for one client, holding a stream slot until the server
+        closes the response; None if LIVE_FEED_MAX_STREAMS are already open
+        """
+        if not stream_slots.acquire(blocking=False):
+            return None
+        return ClosingIterator(self.stream(last_event_id), stream_slots.release)
+
+    def stream(self, last_event_id=None):
+        """Generator of SSE messages for one client"""
+        self.start()
+        with self._condition:
+            seq = self._seq
+            if last_event_id is not None and self._events:
+                # Resume after a reconnect, if the backlog still covers it
+                seq = max(last_event_id, self._events[0][0] - 1)
+
+        yield "retry: 5000\n\n"
+        while True:
+            with self._condition:
+                if self._seq == seq:
+                    self._condition.wait(LIVE_FEED_HEARTBEAT)
+                pending = [event for event in self._events if event[0] > seq]
+
+            if not pending:
+                yield ": ping\n\n"
+                continue
+
+            for event_id, data in pending:
+                yield f"id: {event_id}\nevent: application\ndata: {data}\n\n"
+            seq = pending[-1][0]
@@ -0,0 +1,127 @@
+"""
+Prometheus metrics for DMTT Application Bot and the admin panel
+The bot and the panel each get their own registry, so neither exposes the
+other's (always empty) series:
+
+- bot:   METRICS_PORT=9102 serves bot_registry on METRICS_ADDR (default 127.0.0.1)
+- panel: /metrics serves panel_registry
+
+Recording a sample is a lock plus a few additions, cheap enough for every
+update and request.
+"""
+
+import functools
+import os
+import time
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    GCCollector,
+    PlatformCollector,
+    ProcessCollector,
+)
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Bot metrics HTTP server (0 = off); bound to localhost unless METRICS_ADDR says otherwise
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+METRICS_ADDR = os.getenv("METRICS_ADDR", "127.0.0.1")
+
+# Seconds; finer than the default buckets at the low end, where panel routes live
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+bot_registry = CollectorRegistry()
+panel_registry = CollectorRegistry()
+for registry in (bot_registry, panel_registry):
+    ProcessCollector(registry=registry)
+    PlatformCollector(registry=registry)
+    GCCollector(registry=registry)
+
+# ============================================================================
+# BOT METRICS
+# ============================================================================
+
+HANDLER_SECONDS = Histogram(
+    'dmtt_bot_handler_seconds', "Time spent in a conversation handler, replies included",
+    ['handler'], buckets=LATENCY_BUCKETS, registry=bot_registry
+)
+CONVERSATIONS_STARTED = Counter(
+    'dmtt_bot_conversations_started_total', "Conversations started with /start or /restart",
+    registry=bot_registry
+)
+CONVERSATIONS_COMPLETED = Counter(
+    'dmtt_bot_conversations_completed_total', "Conversations that reached the end",
+    ['outcome'], registry=bot_registry
+)
+CONVERSATIONS_ABANDONED = Counter(
+    'dmtt_bot_conversations_abandoned_total',
+    "Conversations dropped by /cancel or a new /start, by the step they were waiting for",
+    ['stage'], registry=bot_registry
+)
+RATE_LIMITED = Counter(
+    'dmtt_bot_rate_limited_total', "Updates dropped before the conversation (coalesced, user, global)",
+    ['reason'], registry=bot_registry
+)
+RATE_LIMIT_TRACKED_CHATS = Gauge(
+    'dmtt_bot_rate_limit_tracked_chats', "Recently active chats with a rate limit bucket",
+    registry=bot_registry
+)
+STORAGE_WRITE_SECONDS = Histogram(
+    'dmtt_bot_storage_write_seconds', "Time from submitting an application until it is on disk",
+    buckets=LATENCY_BUCKETS, registry=bot_registry
+)
+STORAGE_WRITE_BATCH_ROWS = Histogram(
+    'dmtt_bot_storage_write_batch_rows', "Applications stored per group commit",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250), registry=bot_registry
+)
+STORAGE_WRITE_FAILURES = Counter(
+    'dmtt_bot_storage_write_failures_total', "Applications that could not be stored",
+    registry=bot_registry
+)
+ADMIN_FORWARD_SECONDS = Histogram(
+    'dmtt_bot_admin_forward_seconds', "Time to deliver one notification to an admin",
+    buckets=LATENCY_BUCKETS, registry=bot_registry
+)
+ADMIN_FORWARD_FAILURES = Counter(
+    'dmtt_bot_admin_forward_failures_total',
+    "Failed admin notification attempts (rate_limited, rejected, error, gave_up)",
+    ['reason'], registry=bot_registry
+)
+ADMIN_OUTBOX_PENDING = Gauge(
+    'dmtt_bot_admin_outbox_pending', "Admin notifications waiting to be delivered",
+    registry=bot_registry
+)
+
+# ============================================================================
+# PANEL METRICS
+# ============================================================================
+
+REQUEST_SECONDS = Histogram(
+    'dmtt_panel_request_seconds', "Admin panel request handling time (streams: until the first byte)",
+    ['endpoint', 'method', 'status'], buckets=LATENCY_BUCKETS, registry=panel_registry
+)
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def timed_handler(name):
+    """Decorator recording an async handler's duration in HANDLER_SECONDS"""
+    histogram = HANDLER_SECONDS.labels(name)
+
+    def decorate(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await handler(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+        return wrapper
+
+    return decorate
@@ -0,0 +1,222 @@
+"""
+Admin notification queue for DMTT Application Bot
+
+receive_pdf() only writes notifications to a persisted outbox (SQLite);
+a background task delivers them to the admins concurrently, so the
+applicant's conversation never waits on Telegram round-trips.
+
+- one send_document call per admin (the details go in the caption; text
+  too long for a caption follows the document as a message)
+- Telegram 429 responses pause all deliveries for retry_after seconds
+- other failures are retried with exponential backoff
+- pending notifications survive a bot restart
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from telegram.error import BadRequest, Forbidden, RetryAfter
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+OUTBOX_FILE = os.getenv("OUTBOX_FILE", "outbox.db")
+NOTIFY_CONCURRENCY = int(os.getenv("NOTIFY_CONCURRENCY", "5"))
+NOTIFY_MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", "8"))
+NOTIFY_MAX_BACKOFF = 300  # seconds
+
+# Pause after an unexpected error in the delivery loop (e.g. outbox.db locked)
+NOTIFY_ERROR_PAUSE = 5  # seconds
+
+# Telegram's limits for a document caption and a message
+CAPTION_MAX_LENGTH = 1024
+MESSAGE_MAX_LENGTH = 4096
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id INTEGER NOT NULL,
+    document TEXT NOT NULL,
+    caption TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_next_attempt ON outbox (next_attempt);
+"""
+
+# ============================================================================
+# ADMIN NOTIFIER
+# ============================================================================
+
+class AdminNotifier:
+    """
+    Persisted outbox plus a background delivery task.
+
+    Hook it into the Application lifecycle (bot.post_init / bot.post_stop):
+
+        await notifier.start(application)  ...  await notifier.stop(application)
+    """
+
+    def __init__(self, path=OUTBOX_FILE, concurrency=NOTIFY_CONCURRENCY,
+                 max_attempts=NOTIFY_MAX_ATTEMPTS):
+        self.path = path
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.bot = None
+        self._local = threading.local()
+        self._connect()
+        self._wake = None
+        self._task = None
+        self._paused_until = 0.0
+
+    def _connect(self):
+        """This thread's connection to the outbox"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _insert(self, chat_ids, document, caption):
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO outbox (chat_id, document, caption, next_attempt) VALUES (?, ?, ?, ?)",
+                [(chat_id, document, caption, now) for chat_id in chat_ids]
+            )
+
+    async def enqueue(self, chat_ids, document, caption):
+        """Persist one notification per admin (in a thread) and wake the delivery task"""
+        chat_ids = list(chat_ids)
+        await asyncio.to_thread(self._insert, chat_ids, document, caption)
+        metrics.ADMIN_OUTBOX_PENDING.inc(len(chat_ids))
+        if self._wake:
+            self._wake.set()
+
+    def pending(self):
+        """Number of notifications not yet delivered"""
+        return self._connect().execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    async def start(self, application):
+        """post_init hook: start delivering (including anything left from last run)"""
+        self.bot = application.bot
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        pending = self.pending()
+        metrics.ADMIN_OUTBOX_PENDING.set(pending)
+        if pending:
+            logger.info(f"Resuming {pending} pending admin notification(s)")
+
+    async def stop(self, application):
+        """post_stop hook: stop the delivery task; undelivered rows stay in the outbox"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _due(self):
+        return self._connect().execute(
+            "SELECT id, chat_id, document, caption, attempts FROM outbox "
+            "WHERE next_attempt <= ? ORDER BY id LIMIT ?",
+            (time.time(), self.concurrency * 4)
+        ).fetchall()
+
+    def _next_due_in(self):
+        row = self._connect().execute("SELECT MIN(next_attempt) FROM outbox").fetchone()
+        return None if row[0] is None else max(row[0] - time.time(), 0)
+
+    def _delete(self, job_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM outbox WHERE id = ?", (job_id,))
+        metrics.ADMIN_OUTBOX_PENDING.dec()
+
+    def _document_sent(self, job_id):
+        """The document went out without its caption; a retry only sends the text"""
+        with self._connect() as conn:
+            conn.execute("UPDATE outbox SET document = '' WHERE id = ?", (job_id,))
+
+    async def _send(self, job_id, chat_id, document, caption):
+        if document and len(caption) <= CAPTION_MAX_LENGTH:
+            await self.bot.send_document(chat_id=chat_id, document=document, caption=caption)
+            return
+        if document:
+            await self.bot.send_document(chat_id=chat_id, document=document)
+            self._document_sent(job_id)
+        await self.bot.send_message(chat_id=chat_id, text=caption[:MESSAGE_MAX_LENGTH])
+
+    def _reschedule(self, job_id, delay, attempts):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox SET next_attempt = ?, attempts = ? WHERE id = ?",
+                (time.time() + delay, attempts, job_id)
+            )
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        while True:
+            try:
+                jobs = self._due()
+                if jobs:
+                    await asyncio.gather(*(self._deliver(semaphore, *job) for job in jobs))
+                    continue
+
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self._next_due_in())
+                except asyncio.TimeoutError:
+                    pass
+            except Exception as e:
+                # Keep delivering; the outbox still holds whatever wasn't sent
+                logger.error(f"Error in admin notification delivery: {e}")
+                await asyncio.sleep(NOTIFY_ERROR_PAUSE)
+
+    async def _deliver(self, semaphore, job_id, chat_id, document, caption, attempts):
+        async with semaphore:
+            # Flood control: wait out a 429 seen by any delivery
+            delay = self._paused_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            started = time.perf_counter()
+            try:
+                await self._send(job_id, chat_id, document, caption)
+            except RetryAfter as e:
+                metrics.ADMIN_FORWARD_FAILURES.labels('rate_limited').inc()
+                retry_after = float(e.retry_after)
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+                logger.warning(f"Rate limited by Telegram, retrying in {retry_after}s")
+                self._reschedule(job_id, retry_after, attempts)
+            except (BadRequest, Forbidden) as e:
+                # Permanent: wrong chat id, admin blocked the bot, bad file id
+                metrics.ADMIN_FORWARD_FAILURES.labels('rejected').inc()
+                logger.error(f"Error forwarding to admin {chat_id}: {e}")
+                self._delete(job_id)
+            except Exception as e:
+                metrics.ADMIN_FORWARD_FAILURES.labels('error').inc()
+                attempts += 1
+                if attempts >= self.max_attempts:
+                    metrics.ADMIN_FORWARD_FAILURES.labels('gave_up').inc()
+                    logger.error(f"Giving up forwarding to admin {chat_id} after {attempts} attempts: {e}")
+                    self._delete(job_id)
+                else:
+                    backoff = min(2 ** attempts, NOTIFY_MAX_BACKOFF)
+                    logger.warning(f"Error forwarding to admin {chat_id} (retry in {backoff}s): {e}")
+                    self._reschedule(job_id, backoff, attempts)
+            else:
+                metrics.ADMIN_FORWARD_SECONDS.observe(time.perf_counter() - started)
+                logger.info(f"Application forwarded to admin {chat_id}")
+                self._delete(job_id)
@@ -0,0 +1,166 @@
+"""
+Local PDF cache for DMTT applications
+Content-addressed storage for documents downloaded from Telegram:
+
+- objects/<sha256>.pdf   one copy per distinct file content
+- refs/<key>             File ID / file_unique_id -> sha256 of the content
+- derived/<sha256>.*     extracted text and thumbnail (see pdf_checker.py)
+
+Objects are evicted least-recently-used first once the folder grows past
+PDF_CACHE_MAX_MB, and after PDF_CACHE_MAX_AGE_DAYS without being served.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PDF_CACHE_FOLDER = os.getenv("PDF_CACHE_FOLDER", os.path.join("downloaded_pdfs", "cache"))
+PDF_CACHE_MAX_MB = int(os.getenv("PDF_CACHE_MAX_MB", "1024"))
+PDF_CACHE_MAX_AGE_DAYS = int(os.getenv("PDF_CACHE_MAX_AGE_DAYS", "30"))
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def remove_quietly(path):
+    """Remove a file that another worker may already have removed"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+# ============================================================================
+# PDF CACHE
+# ============================================================================
+
+class PdfCache:
+    """Content-addressed PDF cache with size/age-based LRU eviction"""
+
+    def __init__(self, folder=PDF_CACHE_FOLDER, max_mb=PDF_CACHE_MAX_MB,
+                 max_age_days=PDF_CACHE_MAX_AGE_DAYS):
+        # Absolute, so Flask's send_file doesn't resolve it against the app root
+        self.folder = os.path.abspath(folder)
+        self.max_bytes = max_mb * 1024 * 1024
+        self.max_age = max_age_days * 24 * 3600
+        self.objects_dir = os.path.join(self.folder, 'objects')
+        self.refs_dir = os.path.join(self.folder, 'refs')
+        self.tmp_dir = os.path.join(self.folder, 'tmp')
+        self.derived_dir = os.path.join(self.folder, 'derived')
+        for path in (self.objects_dir, self.refs_dir, self.tmp_dir, self.derived_dir):
+            os.makedirs(path, exist_ok=True)
+
+    def _ref_path(self, key):
+        # Telegram ids are URL-safe base64, but never trust them as file names
+        return os.path.join(self.refs_dir, re.sub(r'[^A-Za-z0-9_-]', '_', key))
+
+    def object_path(self, digest):
+        """Path of the cached object with the given content hash"""
+        return os.path.join(self.objects_dir, f"{digest}.pdf")
+
+    def _read_ref(self, key):
+        try:
+            with open(self._ref_path(key), 'r') as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def _write_ref(self, key, digest):
+        fd, tmp = tempfile.mkstemp(dir=self.tmp_dir)
+        with os.fdopen(fd, 'w') as f:
+            f.write(digest)
+        os.replace(tmp, self._ref_path(key))
+
+    def lookup(self, *keys):
+        """
+        Path of the cached PDF for the first key that has one, or None.
+        All given keys are linked to the hit, and the hit counts as a use.
+        """
+        for key in filter(None, keys):
+            digest = self._read_ref(key)
+            if not digest:
+                continue
+            path = self.object_path(digest)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                # Object was evicted; drop the dangling reference
+                remove_quietly(self._ref_path(key))
+                continue
+            for other in filter(None, keys):
+                if other != key:
+                    self._write_ref(other, digest)
+            return path
+        return None
+
+    def temp_path(self):
+        """A fresh temporary file path inside the cache (same filesystem)"""
+        fd, path = tempfile.mkstemp(dir=self.tmp_dir, suffix='.pdf')
+        os.close(fd)
+        return path
+
+    def store(self, tmp_path, *keys):
+        """
+        Move a downloaded file into the cache under its content hash and link
+        keys to it. Identical content is stored once. Returns the cached path.
+        """
+        sha = hashlib.sha256()
+        with open(tmp_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(block)
+        digest = sha.hexdigest()
+
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            os.utime(path)
+        else:
+            os.replace(tmp_path, path)
+
+        for key in filter(None, keys):
+            self._write_ref(key, digest)
+
+        self.evict(keep=path)
+        return path
+
+    def digest_of(self, path):
+        """Content hash of a cached object (its file name)"""
+        return os.path.splitext(os.path.basename(path))[0]
+
+    def derived_path(self, digest, suffix):
+        """Path of a file derived from an object (e.g. '.txt', '.png'); removed with it"""
+        return os.path.join(self.derived_dir, f"{digest}{suffix}")
+
+    def _remove_object(self, path):
+        remove_quietly(path)
+        digest = self.digest_of(path)
+        for suffix in ('.txt', '.png'):
+            remove_quietly(self.derived_path(digest, suffix))
+
+    def evict(self, keep=None):
+        """Remove expired objects, then least recently used ones until under the size limit"""
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.objects_dir):
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            if entry.path != keep and now - st.st_mtime > self.max_age:
+                self._remove_object(entry.path)
+                continue
+            entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self._remove_object(path)
+            total -= size
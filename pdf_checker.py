@@ -0,0 +1,342 @@
+"""
+PDF content checks for DMTT Application Bot
+receive_pdf() only sees a file name and size. This background stage fetches
+each submitted document into the local PDF cache and checks what it really
+is: PDF header and trailer, whether it opens, encryption and page count.
+Valid documents get their text and a first-page thumbnail extracted next to
+the cached PDF, and the text is added to the full-text index (text_index.py).
+
+Parsing runs in a process pool (PyMuPDF), so its CPU cost never blocks the
+bot's event loop. Results are kept per application in a small SQLite file
+(see job_queue.py), which the admin panel reads:
+
+    pending -> checking -> valid
+                        -> invalid (not_pdf, damaged, encrypted, empty)
+                        -> pending (retried with backoff) -> ... -> failed
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from job_queue import JobQueue
+from pdf_cache import PdfCache, remove_quietly
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PDF_CHECK = os.getenv("PDF_CHECK", "1").lower() in ("1", "true", "yes")
+PDF_CHECK_FILE = os.getenv("PDF_CHECK_FILE", "pdf_checks.db")
+PDF_CHECK_WORKERS = int(os.getenv("PDF_CHECK_WORKERS", "2"))
+PDF_CHECK_MAX_ATTEMPTS = int(os.getenv("PDF_CHECK_MAX_ATTEMPTS", "6"))
+
+# Seconds between checks for new applications when idle
+PDF_CHECK_INTERVAL = float(os.getenv("PDF_CHECK_INTERVAL", "2"))
+
+PDF_THUMBNAIL_WIDTH = int(os.getenv("PDF_THUMBNAIL_WIDTH", "320"))
+PDF_TEXT_MAX_CHARS = 200000
+
+PDF_CHECK_STATUSES = ('pending', 'checking', 'valid', 'invalid', 'failed')
+
+# What results() reports per application
+RESULT_COLUMNS = ('status', 'problem', 'error', 'pages', 'text_chars', 'digest')
+
+# Problems that make a document invalid, as shown in the admin panel
+PDF_PROBLEMS = {
+    'not_pdf': "PDF emas",
+    'damaged': "Buzilgan fayl",
+    'encrypted': "Parol bilan himoyalangan",
+    'empty': "Bo'sh hujjat",
+}
+
+# Leading bytes of files commonly renamed to .pdf
+FILE_SIGNATURES = [
+    (b'\xff\xd8\xff', "JPEG image"),
+    (b'\x89PNG', "PNG image"),
+    (b'GIF8', "GIF image"),
+    (b'PK\x03\x04', "ZIP archive (DOCX/XLSX?)"),
+    (b'\xd0\xcf\x11\xe0', "MS Office 97-2003 document"),
+    (b'{\\rtf', "RTF document"),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pdf_checks (
+    app_id INTEGER PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    file_unique_id TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    problem TEXT NOT NULL DEFAULT '',
+    error TEXT NOT NULL DEFAULT '',
+    pages INTEGER NOT NULL DEFAULT 0,
+    text_chars INTEGER NOT NULL DEFAULT 0,
+    digest TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pdf_checks_status ON pdf_checks (status, next_attempt);
+CREATE INDEX IF NOT EXISTS idx_pdf_checks_updated_at ON pdf_checks (updated_at);
+"""
+
+# ============================================================================
+# INSPECTION (runs in the worker processes)
+# ============================================================================
+
+def sniff_file_type(head: bytes) -> str:
+    """Best guess at what a non-PDF file is, from its first bytes"""
+    for signature, name in FILE_SIGNATURES:
+        if head.startswith(signature):
+            return name
+    return "unknown file type"
+
+def replace_atomically(target, write):
+    """
+    Call write(temporary path) and move the result to target. Applications
+    with the same PDF share their derived files and may be checked at once;
+    readers only ever see a complete file, and the last writer wins.
+    """
+    root, ext = os.path.splitext(target)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target) or '.', prefix='.tmp-', suffix=ext)
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        remove_quietly(tmp)
+        raise
+
+def write_text(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def inspect_pdf(path, text_path, thumbnail_path):
+    """
+    Check one document and extract its text and first-page thumbnail.
+    Returns {'problem', 'error', 'pages', 'text_chars'}; problem is '' for a
+    valid PDF. Failing to extract or write the text and thumbnail raises, as
+    that says nothing about the document (the check is retried).
+    """
+    import fitz  # PyMuPDF, only needed in the worker processes
+
+    result = {'problem': '', 'error': '', 'pages': 0, 'text_chars': 0}
+    with open(path, 'rb') as f:
+        head = f.read(1024)
+        f.seek(max(os.path.getsize(path) - 1024, 0))
+        tail = f.read()
+
+    # The header may follow up to 1 KB of junk; the trailer ends the file
+    if b'%PDF-' not in head:
+        return dict(result, problem='not_pdf', error=sniff_file_type(head))
+    if b'%%EOF' not in tail:
+        return dict(result, problem='damaged', error="no %%EOF trailer (truncated upload?)")
+
+    fitz.TOOLS.mupdf_display_errors(False)
+    try:
+        doc = fitz.open(path, filetype='pdf')
+    except Exception as e:
+        return dict(result, problem='damaged', error=str(e))
+
+    with doc:
+        if doc.needs_pass:
+            return dict(result, problem='encrypted', error="password required to open")
+        result['pages'] = doc.page_count
+        if not doc.page_count:
+            return dict(result, problem='empty', error="no pages")
+
+        text = []
+        chars = 0
+        for page in doc:
+            text.append(page.get_text())
+            chars += len(text[-1])
+            if chars >= PDF_TEXT_MAX_CHARS:
+                break
+        text = "\n".join(text)[:PDF_TEXT_MAX_CHARS]
+
+        first = doc[0]
+        zoom = PDF_THUMBNAIL_WIDTH / max(first.rect.width, 1)
+        pixmap = first.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        replace_atomically(thumbnail_path, lambda tmp: pixmap.save(tmp, output='png'))
+
+    replace_atomically(text_path, lambda tmp: write_text(tmp, text))
+    result['text_chars'] = len(text)
+    return result
+
+# ============================================================================
+# INSPECTION POOL
+# ============================================================================
+
+class InspectionPool:
+    """
+    The worker processes parsing PDFs, shared by every campaign's PdfChecker
+    in the process, so N campaigns still use `workers` processes. Started by
+    the first checker and shut down after the last one stops.
+    """
+
+    def __init__(self, workers=PDF_CHECK_WORKERS):
+        self.workers = workers
+        self._executor = None
+        self._users = 0
+
+    def start(self):
+        self._users += 1
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+
+    def stop(self):
+        self._users -= 1
+        if self._users <= 0 and self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(self, fn, *args):
+        """fn(*args) in a worker process; refused once the pool is stopped"""
+        executor = self._executor
+        if executor is None:
+            # run_in_executor(None, ...) would parse on the loop's thread pool instead
+            raise RuntimeError("PDF inspection pool is not running")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # A worker crashed (e.g. on a malformed file); later checks get a fresh pool
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = ProcessPoolExecutor(self.workers)
+            raise
+
+inspection_pool = InspectionPool()
+
+# ============================================================================
+# PDF CHECKER
+# ============================================================================
+
+class PdfChecker:
+    """
+    Store listener (see storage.subscribe) queueing every application's PDF
+    for a check, plus a background task on the bot's event loop that
+    downloads them (at most `concurrency` at a time) and inspects them in
+    the process pool shared by all campaigns.
+
+    Hook it into the Application lifecycle (bot.post_init / bot.post_stop);
+    the admin panel only reads results.
+    """
+
+    def __init__(self, store, path=PDF_CHECK_FILE, pool=inspection_pool,
+                 max_attempts=PDF_CHECK_MAX_ATTEMPTS, cache=None, text_index=None):
+        self.store = store
+        self.text_index = text_index
+        self.path = path
+        self.pool = pool
+        self.concurrency = pool.workers * 2
+        self.max_attempts = max_attempts
+        self.cache = cache
+        self.bot = None
+        self.queue = JobQueue(path, 'pdf_checks', SCHEMA, ('file_id', 'file_unique_id'), 'checking',
+                              PDF_CHECK_STATUSES, max_attempts)
+        self._started = False
+        self._task = None
+
+    def clear(self):
+        """Results outlive a store reload; checked PDFs are still cached"""
+
+    def add(self, rows):
+        """Queue newly stored applications (already known ones keep their result)"""
+        self.queue.add((app['id'], app.get('File ID', ''), app.get('File unique ID', ''))
+                       for app in rows if app.get('File ID'))
+
+    def results(self, app_ids):
+        """Check result of the given applications, by id"""
+        cursor = self.queue.select(RESULT_COLUMNS, app_ids)
+        return {row[0]: dict(zip(RESULT_COLUMNS, row[1:])) for row in cursor}
+
+    def progress(self):
+        """Number of applications in each status"""
+        return self.queue.progress()
+
+    def valid_digests(self):
+        """(app_id, content hash) of every valid checked PDF"""
+        return self.queue.connect().execute(
+            "SELECT app_id, digest FROM pdf_checks WHERE status = 'valid' AND digest != ''"
+        ).fetchall()
+
+    def version(self):
+        """Token that changes whenever a result changes"""
+        return self.queue.version()
+
+    async def start(self, application):
+        """post_init hook: queue the store's applications and start checking them"""
+        if self.cache is None:
+            self.cache = PdfCache()
+        self.bot = application.bot
+        self.pool.start()
+        self._started = True
+        await asyncio.to_thread(self.store.subscribe, self)
+        self._task = asyncio.create_task(self.queue.run(
+            self.store.refresh, self._check, self.concurrency, PDF_CHECK_INTERVAL, logger.error
+        ))
+
+    async def stop(self, application):
+        """post_stop hook: stop checking; unfinished checks are claimed again later"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._started:
+            self.pool.stop()
+            self._started = False
+
+    async def _fetch(self, file_id, file_unique_id):
+        """Cached path of the document, downloading it from Telegram on a miss"""
+        # Cache I/O (hashing up to 20 MB, eviction scans) stays off the bot's loop
+        cached = await asyncio.to_thread(self.cache.lookup, file_unique_id, file_id)
+        if cached:
+            return cached
+        file = await self.bot.get_file(file_id)
+        filepath = await asyncio.to_thread(self.cache.temp_path)
+        await file.download_to_drive(filepath)
+        return await asyncio.to_thread(self.cache.store, filepath, file_id, file.file_unique_id)
+
+    async def _inspect(self, filepath):
+        digest = self.cache.digest_of(filepath)
+        result = await self.pool.run(
+            inspect_pdf, filepath,
+            self.cache.derived_path(digest, '.txt'), self.cache.derived_path(digest, '.png')
+        )
+        return result, digest
+
+    async def _check(self, app_id, file_id, file_unique_id, attempts):
+        try:
+            result, digest = await self._inspect(await self._fetch(file_id, file_unique_id))
+        except Exception as e:
+            result, error = None, str(e) or type(e).__name__
+
+        if result is not None:
+            status = 'invalid' if result['problem'] else 'valid'
+            if status == 'invalid':
+                logger.info(f"Application {app_id}: {result['problem']} ({result['error']})")
+            elif self.text_index:
+                try:
+                    await asyncio.to_thread(self.text_index.add_file, app_id, digest,
+                                            self.cache.derived_path(digest, '.txt'))
+                except Exception as e:
+                    logger.error(f"Error indexing PDF text of application {app_id}: {e}")
+            await asyncio.to_thread(
+                self.queue.finish, app_id, status, attempts, problem=result['problem'],
+                error=result['error'], pages=result['pages'], text_chars=result['text_chars'],
+                digest=digest
+            )
+            return
+
+        backoff = await asyncio.to_thread(self.queue.retry, app_id, attempts, error)
+        if backoff is None:
+            logger.error(f"Giving up checking PDF for application {app_id}: {error}")
+        else:
+            logger.warning(f"Error checking PDF for application {app_id} (retry in {backoff}s): {error}")
@@ -0,0 +1,170 @@
+"""
+Conversation persistence for DMTT Application Bot
+Keeps ConversationHandler states and user_data (name, phone) in SQLite so a
+restart or redeploy doesn't send half-finished applicants back to /start.
+
+PTB hands over changed entries every PERSISTENCE_INTERVAL seconds; all of
+them are written in a single transaction, never one write per update.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+
+from telegram.ext import BasePersistence, PersistenceInput
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PERSISTENCE_FILE = os.getenv("PERSISTENCE_FILE", "bot_state.db")
+PERSISTENCE_INTERVAL = float(os.getenv("PERSISTENCE_INTERVAL", "5"))
+
+# Conversations untouched for this long are dropped at startup
+PERSISTENCE_MAX_AGE_DAYS = int(os.getenv("PERSISTENCE_MAX_AGE_DAYS", "14"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS user_data (
+    user_id INTEGER PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS conversations (
+    name TEXT NOT NULL,
+    conv_key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (name, conv_key)
+);
+"""
+
+# ============================================================================
+# SQLITE PERSISTENCE
+# ============================================================================
+
+class SqlitePersistence(BasePersistence):
+    """
+    BasePersistence storing user_data and conversation states in SQLite.
+    Chat data, bot data and callback data are not used by the bot and are
+    not stored.
+    """
+
+    def __init__(self, path=PERSISTENCE_FILE, update_interval=PERSISTENCE_INTERVAL,
+                 max_age_days=PERSISTENCE_MAX_AGE_DAYS):
+        super().__init__(
+            store_data=PersistenceInput(bot_data=False, chat_data=False,
+                                        user_data=True, callback_data=False),
+            update_interval=update_interval,
+        )
+        self.path = path
+        self.max_age = max_age_days * 24 * 3600
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._pending = []
+        self._commit_scheduled = False
+
+    def _stage(self, sql, params):
+        """Queue a write; everything staged in one persistence run commits together"""
+        self._pending.append((sql, params))
+        if not self._commit_scheduled:
+            self._commit_scheduled = True
+            # Runs after the Application has handed over all changed entries
+            asyncio.get_running_loop().call_soon(self._commit)
+
+    def _commit(self):
+        self._commit_scheduled = False
+        pending, self._pending = self._pending, []
+        if pending:
+            with self._conn:
+                for sql, params in pending:
+                    self._conn.execute(sql, params)
+
+    def _prune(self):
+        """Drop conversations and user data of applicants who never came back"""
+        cutoff = time.time() - self.max_age
+        with self._conn:
+            self._conn.execute("DELETE FROM conversations WHERE updated_at < ?", (cutoff,))
+            self._conn.execute("DELETE FROM user_data WHERE updated_at < ?", (cutoff,))
+
+    # Loading (once, at startup) ------------------------------------------------
+
+    async def get_user_data(self):
+        self._prune()
+        return {
+            user_id: json.loads(data)
+            for user_id, data in self._conn.execute("SELECT user_id, data FROM user_data")
+        }
+
+    async def get_conversations(self, name):
+        return {
+            tuple(json.loads(conv_key)): json.loads(state)
+            for conv_key, state in self._conn.execute(
+                "SELECT conv_key, state FROM conversations WHERE name = ?", (name,)
+            )
+        }
+
+    async def get_chat_data(self):
+        return {}
+
+    async def get_bot_data(self):
+        return {}
+
+    async def get_callback_data(self):
+        return None
+
+    # Updating (batched by the Application every update_interval) ---------------
+
+    async def update_user_data(self, user_id, data):
+        if data:
+            self._stage(
+                "INSERT OR REPLACE INTO user_data (user_id, data, updated_at) VALUES (?, ?, ?)",
+                (user_id, json.dumps(data), time.time())
+            )
+        else:
+            self._stage("DELETE FROM user_data WHERE user_id = ?", (user_id,))
+
+    async def drop_user_data(self, user_id):
+        self._stage("DELETE FROM user_data WHERE user_id = ?", (user_id,))
+
+    async def update_conversation(self, name, key, new_state):
+        conv_key = json.dumps(list(key))
+        if new_state is None:
+            # Finished conversations are not kept
+            self._stage(
+                "DELETE FROM conversations WHERE name = ? AND conv_key = ?", (name, conv_key)
+            )
+        else:
+            self._stage(
+                "INSERT OR REPLACE INTO conversations (name, conv_key, state, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (name, conv_key, json.dumps(new_state), time.time())
+            )
+
+    async def update_chat_data(self, chat_id, data):
+        pass
+
+    async def update_bot_data(self, data):
+        pass
+
+    async def update_callback_data(self, data):
+        pass
+
+    async def drop_chat_data(self, chat_id):
+        pass
+
+    async def refresh_user_data(self, user_id, user_data):
+        pass
+
+    async def refresh_chat_data(self, chat_id, chat_data):
+        pass
+
+    async def refresh_bot_data(self, bot_data):
+        pass
+
+    async def flush(self):
+        """Write anything still pending (called on shutdown)"""
+        self._commit()
+        self._conn.close()
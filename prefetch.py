@@ -0,0 +1,138 @@
+"""
+Background PDF prefetch for the DMTT admin panel
+Mirrors each application's PDF into the local cache as soon as the store
+sees it, so /download/<id> is served from disk instead of waiting on
+Telegram (and doesn't depend on Telegram file links staying valid).
+
+Progress is kept per application in a small SQLite file (see job_queue.py),
+so several panel workers share the queue without downloading the same PDF
+twice:
+
+    pending -> downloading -> done
+                           -> pending (retried with backoff) -> ... -> failed
+
+Every campaign has its own status file (see campaigns.py). Run it inside
+the panel (PDF_PREFETCH=1), where it shares the panel's Telegram client,
+or next to it on the same disk:
+
+    python prefetch.py
+"""
+
+import asyncio
+import os
+import time
+
+from job_queue import JobQueue
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PDF_PREFETCH = os.getenv("PDF_PREFETCH", "0").lower() in ("1", "true", "yes")
+PREFETCH_FILE = os.getenv("PREFETCH_FILE", "prefetch.db")
+PREFETCH_CONCURRENCY = int(os.getenv("PREFETCH_CONCURRENCY", "4"))
+PREFETCH_MAX_ATTEMPTS = int(os.getenv("PREFETCH_MAX_ATTEMPTS", "6"))
+
+# Seconds between checks for new applications when idle
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", "2"))
+
+PREFETCH_STATUSES = ('pending', 'downloading', 'done', 'failed')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS prefetch (
+    app_id INTEGER PRIMARY KEY,
+    file_id TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    error TEXT NOT NULL DEFAULT '',
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_prefetch_status ON prefetch (status, next_attempt);
+CREATE INDEX IF NOT EXISTS idx_prefetch_updated_at ON prefetch (updated_at);
+"""
+
+# ============================================================================
+# PDF PREFETCHER
+# ============================================================================
+
+class PdfPrefetcher:
+    """
+    Store listener (see storage.subscribe) queueing every application's PDF,
+    plus a background task on the shared TelegramClient loop downloading them
+    with fetch(file_id, filename, bot), at most `concurrency` at a time.
+    fetch returns the cached path or None.
+    """
+
+    def __init__(self, store, fetch, client, path=PREFETCH_FILE,
+                 concurrency=PREFETCH_CONCURRENCY, max_attempts=PREFETCH_MAX_ATTEMPTS):
+        self.store = store
+        self.fetch = fetch
+        self.client = client
+        self.path = path
+        self.concurrency = concurrency
+        self.queue = JobQueue(path, 'prefetch', SCHEMA, ('file_id', 'file_name'), 'downloading',
+                              PREFETCH_STATUSES, max_attempts)
+        self._task = None
+
+    def clear(self):
+        """Statuses outlive a store reload; downloaded PDFs are still cached"""
+
+    def add(self, rows):
+        """Queue newly stored applications (already known ones keep their status)"""
+        self.queue.add((app['id'], app.get('File ID', ''), app.get('Fayl nomi', ''))
+                       for app in rows if app.get('File ID'))
+
+    def statuses(self, app_ids):
+        """Prefetch status of the given applications, by id"""
+        return dict(self.queue.select(['status'], app_ids))
+
+    def progress(self):
+        """Number of applications in each status"""
+        return self.queue.progress()
+
+    def version(self):
+        """Token that changes whenever a status changes"""
+        return self.queue.version()
+
+    def start(self):
+        """Queue the store's applications and start downloading them (once per process)"""
+        if self._task is None:
+            self.store.subscribe(self)
+            self._task = self.client.spawn(
+                self.queue.run(self.store.refresh, self._download, self.concurrency, PREFETCH_INTERVAL)
+            )
+
+    async def _download(self, app_id, file_id, file_name, attempts):
+        try:
+            bot = await self.client.get_bot()
+            filepath = await self.fetch(file_id, file_name, bot)
+            error = '' if filepath else 'download failed'
+        except Exception as e:
+            filepath, error = None, str(e)
+
+        if filepath:
+            await asyncio.to_thread(self.queue.finish, app_id, 'done', attempts)
+        elif await asyncio.to_thread(self.queue.retry, app_id, attempts, error) is None:
+            print(f"Giving up prefetching PDF for application {app_id}: {error}")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    from admin_panel import CAMPAIGNS, get_panel
+
+    print("📥 PDF prefetch ishga tushmoqda...")
+    print("🛑 To'xtatish uchun Ctrl+C bosing")
+    prefetchers = {slug: get_panel(slug).prefetcher for slug in CAMPAIGNS}
+    for prefetcher in prefetchers.values():
+        prefetcher.start()
+    try:
+        while True:
+            time.sleep(60)
+            for slug, prefetcher in prefetchers.items():
+                print(f"Prefetch ({slug}): {prefetcher.progress()}")
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,196 @@
+"""
+Flood protection for DMTT Application Bot
+Token buckets checked before the ConversationHandler (handler group -1):
+
+- per chat:  RATE_LIMIT_USER_BURST updates at once, refilled at
+             RATE_LIMIT_USER_RATE per second; excess updates are dropped
+             silently (no reply, no API call)
+- global:    new conversations (/start, /restart) of all chats together,
+             so a flood of scripted clients can't use up the bot's outgoing
+             API budget. Applicants already in a conversation are never
+             held back by it, and a chat refused a new conversation is told
+             once to try again later.
+- coalescing: the same text, command or document repeated by a chat within
+             RATE_LIMIT_COALESCE_WINDOW seconds (double taps, client resends)
+             is handled once
+
+Refused updates are counted in dmtt_bot_rate_limited_total. A chat's bucket
+is forgotten once it has been idle long enough to be full again, so memory
+stays proportional to the number of recently active chats.
+"""
+
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from telegram import Update
+from telegram.ext import ApplicationHandlerStop, ContextTypes
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+RATE_LIMIT = os.getenv("RATE_LIMIT", "1").lower() in ("1", "true", "yes")
+RATE_LIMIT_USER_BURST = float(os.getenv("RATE_LIMIT_USER_BURST", "8"))
+RATE_LIMIT_USER_RATE = float(os.getenv("RATE_LIMIT_USER_RATE", "0.5"))
+# New conversations: a campaign opening brings a few thousand applicants in
+# minutes, each conversation costing ~5 outgoing messages over a minute or two
+RATE_LIMIT_GLOBAL_BURST = float(os.getenv("RATE_LIMIT_GLOBAL_BURST", "1000"))
+RATE_LIMIT_GLOBAL_RATE = float(os.getenv("RATE_LIMIT_GLOBAL_RATE", "20"))
+RATE_LIMIT_COALESCE_WINDOW = float(os.getenv("RATE_LIMIT_COALESCE_WINDOW", "2"))
+
+# Commands starting a conversation, the only updates the global limit applies to
+START_COMMANDS = ('/start', '/restart')
+
+BUSY_MESSAGE = (
+    "⏳ Hozir ariza topshiruvchilar juda ko'p.\n\n"
+    "Iltimos, bir necha daqiqadan so'ng /start buyrug'ini qayta yuboring."
+)
+
+# ============================================================================
+# TOKEN BUCKETS
+# ============================================================================
+
+class Bucket:
+    """Token bucket plus the last update seen, for coalescing"""
+
+    __slots__ = ('tokens', 'updated', 'fingerprint', 'seen_at', 'limited', 'told_busy')
+
+    def __init__(self, tokens, now):
+        self.tokens = tokens
+        self.updated = now
+        self.fingerprint = None
+        self.seen_at = 0.0
+        self.limited = False
+        self.told_busy = False
+
+    def refill(self, burst, rate, now):
+        self.tokens = min(burst, self.tokens + max(now - self.updated, 0) * rate)
+        self.updated = now
+
+
+class RateLimiter:
+    """
+    Per-chat and global token buckets. Register check() ahead of the
+    conversation:
+
+        application.add_handler(TypeHandler(Update, limiter.check), group=-1)
+    """
+
+    def __init__(self, user_burst=RATE_LIMIT_USER_BURST, user_rate=RATE_LIMIT_USER_RATE,
+                 global_burst=RATE_LIMIT_GLOBAL_BURST, global_rate=RATE_LIMIT_GLOBAL_RATE,
+                 coalesce_window=RATE_LIMIT_COALESCE_WINDOW):
+        self.user_burst = user_burst
+        self.user_rate = user_rate
+        self.global_burst = global_burst
+        self.global_rate = global_rate
+        self.coalesce_window = coalesce_window
+        # A bucket idle this long is full again (and nothing is left to coalesce)
+        self.idle_after = max(user_burst / user_rate, coalesce_window)
+        self._global = Bucket(global_burst, time.monotonic())
+        # chat id -> Bucket, least recently active first
+        self._buckets = OrderedDict()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _evict_idle(self, now):
+        """Forget buckets that are full again (O(1) per call, amortized)"""
+        while self._buckets:
+            bucket = next(iter(self._buckets.values()))
+            if now - bucket.updated < self.idle_after:
+                break
+            self._buckets.popitem(last=False)
+
+    def allow(self, key, fingerprint=None, starts_conversation=False, now=None):
+        """
+        Take a token for one update from chat `key` (and a global one if it
+        starts a conversation). Returns None if it may be handled, otherwise
+        why it is refused: 'coalesced', 'user' or 'global'.
+        """
+        now = time.monotonic() if now is None else now
+        self._evict_idle(now)
+
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            bucket = Bucket(self.user_burst, now)
+        else:
+            bucket.refill(self.user_burst, self.user_rate, now)
+        self._buckets[key] = bucket
+
+        if fingerprint is not None and fingerprint == bucket.fingerprint \
+                and now - bucket.seen_at < self.coalesce_window:
+            return 'coalesced'
+        bucket.fingerprint = fingerprint
+        bucket.seen_at = now
+
+        if bucket.tokens < 1:
+            return 'user'
+        if starts_conversation:
+            self._global.refill(self.global_burst, self.global_rate, now)
+            if self._global.tokens < 1:
+                return 'global'
+            self._global.tokens -= 1
+
+        bucket.tokens -= 1
+        return None
+
+    @staticmethod
+    def fingerprint(update: Update):
+        """What makes two messages the same: their text or document"""
+        message = update.effective_message
+        if message is None:
+            return None
+        if message.document:
+            return ('document', message.document.file_unique_id)
+        if message.text:
+            return ('text', message.text)
+        return None
+
+    @staticmethod
+    def starts_conversation(update: Update):
+        """Whether the update is /start or /restart (also as /start@bot)"""
+        message = update.effective_message
+        if message is None or not message.text:
+            return False
+        command = message.text.split(maxsplit=1)[0].split('@')[0]
+        return command in START_COMMANDS
+
+    async def check(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Handler callback: stop excess updates before any other handler sees them"""
+        if not isinstance(update, Update) or update.effective_chat is None:
+            return
+
+        chat_id = update.effective_chat.id
+        starts_conversation = self.starts_conversation(update)
+        reason = self.allow(chat_id, self.fingerprint(update), starts_conversation)
+        metrics.RATE_LIMIT_TRACKED_CHATS.set(len(self._buckets))
+        bucket = self._buckets[chat_id]
+        if reason is None:
+            bucket.limited = bucket.told_busy = False
+            if starts_conversation:
+                self._global.limited = False
+            return
+
+        metrics.RATE_LIMITED.labels(reason).inc()
+        # Log once per flood, not once per dropped update
+        if reason == 'user' and not bucket.limited:
+            bucket.limited = True
+            logger.warning(f"Rate limiting chat {chat_id}")
+        elif reason == 'global':
+            if not self._global.limited:
+                self._global.limited = True
+                logger.warning("Global rate limit reached, refusing new conversations")
+            # One reply per chat, so the applicant knows to come back
+            if not bucket.told_busy:
+                bucket.told_busy = True
+                try:
+                    await update.effective_message.reply_text(BUSY_MESSAGE)
+                except Exception as e:
+                    logger.error(f"Error telling chat {chat_id} the bot is busy: {e}")
+        raise ApplicationHandlerStop
@@ -0,0 +1,202 @@
+"""
+Search index for DMTT applications
+Answers /search without scanning every application:
+
+- names:     trigram index over normalized names (Latin/Cyrillic, apostrophes)
+- phones:    trigram index over digits only
+- usernames: sorted list for prefix matching
+"""
+
+import bisect
+import heapq
+import re
+import threading
+from collections import defaultdict
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEFAULT_LIMIT = 50
+
+# Uzbek Cyrillic -> Latin, so "Ғулом" and "G'ulom" index the same way
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',
+    'ь': '', 'ы': 'i', 'э': 'e', 'ю': 'yu', 'я': 'ya', 'ў': 'o', 'қ': 'q',
+    'ғ': 'g', 'ҳ': 'h',
+}
+
+# o' / oʻ / o’ / o` are all written for the same letter; drop the mark
+APOSTROPHES = "'`ʻʼ‘’´"
+
+NORMALIZE_TABLE = str.maketrans({
+    **CYRILLIC_TO_LATIN,
+    **{mark: '' for mark in APOSTROPHES},
+})
+
+# Scores used to rank matches (higher first, then newest first)
+SCORE_EXACT = 100
+SCORE_USERNAME_EXACT = 90
+SCORE_PREFIX = 80
+SCORE_USERNAME_PREFIX = 70
+SCORE_PHONE_SUFFIX = 60
+SCORE_SUBSTRING = 50
+SCORE_PHONE_SUBSTRING = 40
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def normalize_name(text: str) -> str:
+    """Lowercase, transliterate Cyrillic and drop apostrophes and extra spaces"""
+    return ' '.join(text.lower().translate(NORMALIZE_TABLE).split())
+
+def normalize_digits(text: str) -> str:
+    """Keep digits only"""
+    return re.sub(r'\D', '', text)
+
+def normalize_username(text: str) -> str:
+    """Lowercase username without the leading @ ('N/A' means none)"""
+    text = text.strip().lower()
+    return '' if text == 'n/a' else text.lstrip('@')
+
+def trigrams(text: str) -> set:
+    """Set of 3-character substrings"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+# ============================================================================
+# SEARCH INDEX
+# ============================================================================
+
+class TrigramIndex:
+    """Substring index: trigram -> ids, with candidates verified against the text"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.postings = defaultdict(list)
+        self.prefixes = defaultdict(list)
+        self.texts = {}
+
+    def add(self, app_id, text):
+        if not text:
+            return
+        self.texts[app_id] = text
+        for gram in trigrams(text):
+            self.postings[gram].append(app_id)
+        # Queries shorter than a trigram match word prefixes
+        for word in text.split():
+            for prefix in {word[:1], word[:2]}:
+                self.prefixes[prefix].append(app_id)
+
+    def find(self, query):
+        """Ids whose text contains the query"""
+        if len(query) < 3:
+            return set(self.prefixes.get(query, ()))
+
+        grams = trigrams(query)
+        if any(gram not in self.postings for gram in grams):
+            return set()
+
+        # Start from the rarest trigram and verify each candidate
+        rarest = min((self.postings[gram] for gram in grams), key=len)
+        return {app_id for app_id in rarest if query in self.texts[app_id]}
+
+
+class SearchIndex:
+    """
+    Search index over applications, kept current by subscribing to the store:
+
+        search_index = SearchIndex()
+        store.subscribe(search_index)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._apps = {}
+        self._names = TrigramIndex()
+        self._phones = TrigramIndex()
+        self._usernames = []
+
+    def clear(self):
+        """Drop everything (the store was reloaded from scratch)"""
+        with self._lock:
+            self._reset()
+
+    def add(self, rows):
+        """Index newly stored applications"""
+        with self._lock:
+            usernames = []
+            for app in rows:
+                app_id = app['id']
+                self._apps[app_id] = app
+                self._names.add(app_id, normalize_name(app.get('Ism', '')))
+                self._phones.add(app_id, normalize_digits(app.get('Telefon', '')))
+                username = normalize_username(app.get('Username', ''))
+                if username:
+                    usernames.append((username, app_id))
+
+            if len(usernames) == 1:
+                bisect.insort(self._usernames, usernames[0])
+            elif usernames:
+                self._usernames.extend(usernames)
+                self._usernames.sort()
+
+    def _score_names(self, query, scores):
+        for app_id in self._names.find(query):
+            name = self._names.texts[app_id]
+            if name == query:
+                score = SCORE_EXACT
+            elif name.startswith(query) or f" {query}" in name:
+                score = SCORE_PREFIX
+            else:
+                score = SCORE_SUBSTRING
+            scores[app_id] = max(scores.get(app_id, 0), score)
+
+    def _score_phones(self, digits, scores):
+        for app_id in self._phones.find(digits):
+            phone = self._phones.texts[app_id]
+            if phone == digits:
+                score = SCORE_EXACT
+            elif phone.endswith(digits):
+                score = SCORE_PHONE_SUFFIX
+            else:
+                score = SCORE_PHONE_SUBSTRING
+            scores[app_id] = max(scores.get(app_id, 0), score)
+
+    def _score_usernames(self, prefix, scores):
+        usernames = self._usernames
+        for i in range(bisect.bisect_left(usernames, (prefix,)), len(usernames)):
+            username, app_id = usernames[i]
+            if not username.startswith(prefix):
+                break
+            score = SCORE_USERNAME_EXACT if username == prefix else SCORE_USERNAME_PREFIX
+            scores[app_id] = max(scores.get(app_id, 0), score)
+
+    def search(self, query, limit=DEFAULT_LIMIT, exclude=()):
+        """Best matching applications for a query, best first, at most limit; ids in exclude left out"""
+        name_query = normalize_name(query)
+        digits = normalize_digits(query)
+        username = normalize_username(query)
+        scores = {}
+
+        with self._lock:
+            if name_query:
+                self._score_names(name_query, scores)
+            # Phones are searched when the query looks like a number
+            if len(digits) >= 3 and not re.search(r'[^\d\s+\-()]', query):
+                self._score_phones(digits, scores)
+            if username:
+                self._score_usernames(username, scores)
+            for app_id in exclude:
+                scores.pop(app_id, None)
+
+            ranked = heapq.nsmallest(limit, scores, key=lambda app_id: (-scores[app_id], -app_id))
+            return [self._apps[app_id] for app_id in ranked]
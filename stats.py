@@ -0,0 +1,206 @@
+"""
+Application statistics for the DMTT admin panel
+Running totals and per-hour / per-day buckets, updated incrementally as the
+store sees new applications, so current figures cost O(1) and a chart range
+costs one lookup per bucket. Also logs which admin reviewed which application.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+REVIEWS_FILE = os.getenv("REVIEWS_FILE", "reviews.db")
+
+# interval -> (bucket length, bucket key format; a prefix of 'Sana')
+STATS_INTERVALS = {
+    'hour': (timedelta(hours=1), '%Y-%m-%d %H'),
+    'day': (timedelta(days=1), '%Y-%m-%d'),
+}
+
+# Longest series /api/stats will return
+MAX_STATS_BUCKETS = 24 * 93
+
+REVIEWS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    app_id INTEGER NOT NULL,
+    reviewer TEXT NOT NULL,
+    reviewed_at REAL NOT NULL,
+    PRIMARY KEY (app_id, reviewer)
+);
+"""
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def parse_stats_range(args, now=None):
+    """
+    Parse from/to (YYYY-MM-DD, inclusive) and interval (hour/day) query
+    parameters into (start, end, interval). Defaults: today by hour, or the
+    last 14 days by day. Raises ValueError on invalid values.
+    """
+    interval = args.get('interval', 'day')
+    if interval not in STATS_INTERVALS:
+        raise ValueError(f"interval must be one of: {', '.join(STATS_INTERVALS)}")
+
+    today = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    default_days = 1 if interval == 'hour' else 14
+    date_to = args.get('to')
+    date_from = args.get('from')
+    end = (datetime.strptime(date_to, '%Y-%m-%d') if date_to else today) + timedelta(days=1)
+    start = (datetime.strptime(date_from, '%Y-%m-%d') if date_from
+             else end - timedelta(days=default_days))
+
+    if start >= end:
+        raise ValueError("from must not be after to")
+    if (end - start) / STATS_INTERVALS[interval][0] > MAX_STATS_BUCKETS:
+        raise ValueError(f"range is limited to {MAX_STATS_BUCKETS} {interval}s")
+    return start, end, interval
+
+# ============================================================================
+# APPLICATION STATS
+# ============================================================================
+
+class ApplicationStats:
+    """
+    Store listener (see storage.subscribe) counting applications in total,
+    per day ('YYYY-MM-DD') and per hour ('YYYY-MM-DD HH'). With current_only,
+    an application stops counting once a later one names it as its
+    'Oldingi ID' (DUPLICATE_POLICY=replace).
+    """
+
+    def __init__(self, current_only=False):
+        self.current_only = current_only
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.total = 0
+        self.latest_id = 0
+        self._buckets = {interval: Counter() for interval in STATS_INTERVALS}
+        # current_only: counted applications by id
+        self._counted = {}
+
+    def clear(self):
+        """Drop everything (the store was reloaded from scratch)"""
+        with self._lock:
+            self._reset()
+
+    def add(self, rows):
+        """Count newly stored applications"""
+        with self._lock:
+            days, hours = self._buckets['day'], self._buckets['hour']
+            for app in rows:
+                sana = app.get('Sana', '')
+                days[sana[:10]] += 1
+                hours[sana[:13]] += 1
+            self.total += len(rows)
+            if rows:
+                self.latest_id = max(self.latest_id, rows[-1]['id'])
+            if self.current_only:
+                for app in rows:
+                    self._counted[app['id']] = app
+                    self._uncount(app.get('Oldingi ID', ''))
+
+    def _uncount(self, app_id):
+        previous = self._counted.pop(int(app_id), None) if app_id.isdigit() else None
+        if previous is not None:
+            sana = previous.get('Sana', '')
+            for interval, key in (('day', sana[:10]), ('hour', sana[:13])):
+                counts = self._buckets[interval]
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+            self.total -= 1
+
+    def count_on(self, day):
+        """Applications submitted on a YYYY-MM-DD day"""
+        return self._buckets['day'][day]
+
+    def series(self, start, end, interval='day'):
+        """Zero-filled bucket counts for [start, end), oldest first"""
+        step, fmt = STATS_INTERVALS[interval]
+        counts = self._buckets[interval]
+        points = []
+        with self._lock:
+            moment = start
+            while moment < end:
+                key = moment.strftime(fmt)
+                points.append({'bucket': key, 'count': counts[key]})
+                moment += step
+        return points
+
+    def peak(self, start, end, interval):
+        """Busiest bucket in [start, end) as {'bucket', 'count'}, or None"""
+        fmt = STATS_INTERVALS[interval][1]
+        low, high = start.strftime(fmt), end.strftime(fmt)
+        with self._lock:
+            busiest = max(
+                ((count, key) for key, count in self._buckets[interval].items()
+                 if low <= key < high),
+                default=None
+            )
+        return {'bucket': busiest[1], 'count': busiest[0]} if busiest else None
+
+    def summary(self, start, end, interval='day'):
+        """Series, total, average and peak hour/day for [start, end)"""
+        series = self.series(start, end, interval)
+        total = sum(point['count'] for point in series)
+        return {
+            'interval': interval,
+            'from': start.strftime('%Y-%m-%d'),
+            'to': (end - timedelta(days=1)).strftime('%Y-%m-%d'),
+            'total': total,
+            'average': round(total / len(series), 2) if series else 0,
+            'peak_hour': self.peak(start, end, 'hour'),
+            'peak_day': self.peak(start, end, 'day'),
+            'series': series,
+        }
+
+# ============================================================================
+# REVIEW LOG
+# ============================================================================
+
+class ReviewLog:
+    """
+    Which admin has reviewed (opened the PDF of) which application.
+    Shared by all panel workers through a small SQLite file.
+    """
+
+    def __init__(self, path=REVIEWS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(REVIEWS_SCHEMA)
+
+    def record(self, app_id, reviewer):
+        """Note that reviewer opened an application (only the first time counts)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO reviews (app_id, reviewer, reviewed_at) VALUES (?, ?, ?)",
+                (app_id, reviewer, time.time())
+            )
+
+    def counts(self):
+        """Reviewed applications: total distinct and per reviewer"""
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COUNT(DISTINCT app_id) FROM reviews"
+            ).fetchone()[0]
+            by_admin = dict(self._conn.execute(
+                "SELECT reviewer, COUNT(*) FROM reviews GROUP BY reviewer ORDER BY reviewer"
+            ))
+        return {'total': total, 'by_admin': by_admin}
+
+    def version(self):
+        """Token that changes whenever a review is recorded"""
+        with self._lock:
+            return self._conn.execute("SELECT MAX(rowid) FROM reviews").fetchone()[0] or 0
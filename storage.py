@@ -0,0 +1,761 @@
+"""
+Application storage for DMTT Application Bot
+Pluggable backends shared by bot.py and admin_panel.py:
+
+- csv:    applications.csv, indexed in memory and tailed for appended rows;
+          writers hold an exclusive and readers a shared advisory lock on
+          applications.csv.lock, so rows never interleave or show up half-written
+- sqlite: applications.db in WAL mode with indexes on date, phone and chat_id
+
+append_many() stores a batch of applications in one durable (fsynced) write;
+the bot's writes go through writer.ApplicationWriter, which batches them.
+
+Usage:
+    python storage.py import [applications.csv]   # one-shot CSV -> SQLite
+    python storage.py export [applications.csv]   # SQLite -> CSV
+"""
+
+import bisect
+import csv
+import io
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single-process use only
+    fcntl = None
+
+load_dotenv()
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "csv").lower()
+CSV_FILE = os.getenv("CSV_FILE", "applications.csv")
+SQLITE_FILE = os.getenv("SQLITE_FILE", "applications.db")
+
+CSV_HEADERS = ['Sana', 'Ism', 'Telefon', 'Username', 'Chat ID', 'File ID', 'Fayl nomi',
+               'File unique ID', 'Oldingi ID']
+
+# SQLite column for each CSV header
+SQL_COLUMNS = ['sana', 'ism', 'telefon', 'username', 'chat_id', 'file_id', 'fayl_nomi',
+               'file_unique_id', 'previous_id']
+
+# Keys of the application dict built by bot.py, in CSV column order
+RECORD_KEYS = ['date', 'name', 'phone', 'username', 'chat_id', 'file_id', 'file_name',
+               'file_unique_id', 'previous_id']
+
+# Sortable fields for page(): name -> (CSV header, SQLite column)
+SORT_FIELDS = {
+    'id': ('id', 'id'),
+    'date': ('Sana', 'sana'),
+    'name': ('Ism', 'ism'),
+}
+
+# Exact-match filters for page(): name -> (CSV header, SQLite column)
+FILTER_FIELDS = {
+    'phone': ('Telefon', 'telefon'),
+    'chat_id': ('Chat ID', 'chat_id'),
+    'username': ('Username', 'username'),
+}
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def record_to_values(data: dict) -> list:
+    """Convert an application dict from the bot into CSV column values"""
+    return [str(data.get(key, '')) for key in RECORD_KEYS]
+
+@contextmanager
+def file_lock(path, exclusive=False):
+    """Advisory lock on a lock file (shared for readers, exclusive for writers)"""
+    if fcntl is None:
+        yield
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+def next_day(day: str) -> str:
+    """The YYYY-MM-DD day after the given one"""
+    return (datetime.strptime(day, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+def matches_filters(app: dict, date_from=None, date_until=None, filters=None) -> bool:
+    """Check an application against a [date_from, date_until) range and exact field filters"""
+    sana = app.get('Sana', '')
+    if date_from and sana < date_from:
+        return False
+    if date_until and sana >= date_until:
+        return False
+    for field, value in (filters or {}).items():
+        if app.get(FILTER_FIELDS[field][0], '') != value:
+            return False
+    return True
+
+def slice_page(rows, limit, offset=0, cursor=None, order='desc'):
+    """
+    Cut one page out of rows in ascending order (by id, if a cursor is given).
+    With a cursor (an id from the previous page) the page starts right after
+    it in the requested order, so deep pages cost the same as the first one.
+    """
+    if cursor is not None:
+        if order == 'asc':
+            offset += bisect.bisect_right(rows, cursor, key=lambda row: row['id'])
+        else:
+            offset += len(rows) - bisect.bisect_left(rows, cursor, key=lambda row: row['id'])
+
+    if order == 'asc':
+        return rows[offset:offset + limit]
+
+    end = len(rows) - offset
+    if end <= 0:
+        return []
+    return rows[max(end - limit, 0):end][::-1]
+
+# ============================================================================
+# CSV STORE
+# ============================================================================
+
+class CsvApplicationStore:
+    """
+    In-process index over applications.csv.
+
+    The file is parsed once; later calls only read the bytes appended since
+    the previous call (tracked by offset, inode and mtime). Rows get a stable
+    1-based id in file order and are kept in an id-keyed index.
+
+    Listeners registered with subscribe() are objects with add(rows) and
+    clear() methods; they see every row exactly once, as it is indexed.
+
+    page() is served from indexes built on first use and kept up to date as
+    rows are appended: rows by value for each exact-match filter, and rows
+    in (value, id) order for each sort field. Rows normally arrive in date
+    order, so dates use the id order itself (bisected for date ranges) until
+    a row arrives out of order. The same indexes are kept over the current
+    applications (those no later row names as its 'Oldingi ID') for
+    page(current_only=True).
+    """
+
+    def __init__(self, path=CSV_FILE):
+        self.path = path
+        self.lock_path = path + '.lock'
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._reset()
+
+    def _reset(self):
+        for listener in self._listeners:
+            listener.clear()
+        self._rows = []
+        self._header = None
+        self._offset = 0
+        self._inode = None
+        self._mtime = None
+        self._day_counts = Counter()
+        # Whether rows so far are in date order (so date order is id order)
+        self._dates_in_order = True
+        # filter field -> {value: rows, by id}; sort field -> rows by (value, id)
+        self._by_value = {}
+        self._sorted = {}
+        # Ids of applications replaced by a later one, and the others by id / (value, id)
+        self._replaced = set()
+        self._current = []
+        self._sorted_current = {}
+
+    def init(self):
+        """Create the CSV file with headers if it doesn't exist (or update an older header)"""
+        if not os.path.exists(self.path):
+            with open(self.path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(CSV_HEADERS)
+            return True
+        with self._lock, file_lock(self.lock_path, exclusive=True):
+            self._migrate_header()
+        return False
+
+    def _migrate_header(self):
+        """
+        Rewrite a header from before columns were added as CSV_HEADERS, so
+        Excel and other CSV readers line up the longer rows written since.
+        The file is replaced (new inode): every reader indexes it again.
+        Call with the exclusive lock held.
+        """
+        try:
+            f = open(self.path, 'r', newline='', encoding='utf-8')
+        except FileNotFoundError:
+            return False
+        with f:
+            header = next(csv.reader([f.readline()]), [])
+            if not header or len(header) >= len(CSV_HEADERS):
+                return False
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                       prefix='.tmp-', suffix='.csv')
+            try:
+                with os.fdopen(fd, 'w', newline='', encoding='utf-8') as out:
+                    csv.writer(out).writerow(CSV_HEADERS)
+                    shutil.copyfileobj(f, out)
+                    out.flush()
+                    os.fsync(out.fileno())
+            except BaseException:
+                os.remove(tmp)
+                raise
+        os.replace(tmp, self.path)
+        return True
+
+    def append(self, data: dict):
+        """Append an application and return its id"""
+        return self.append_many([data])[0]
+
+    def append_many(self, records):
+        """
+        Append applications in one write, fsynced before returning their ids.
+        Other processes' rows are indexed first, so the rows read back after
+        the write (under the exclusive lock) are exactly these.
+        """
+        buffer = io.StringIO(newline='')
+        csv.writer(buffer).writerows(record_to_values(data) for data in records)
+        with self._lock, file_lock(self.lock_path, exclusive=True):
+            self._refresh()
+            if self._header and len(self._header) < len(CSV_HEADERS) and self._migrate_header():
+                self._refresh()
+            with open(self.path, 'a', newline='', encoding='utf-8') as f:
+                f.write(buffer.getvalue())
+                f.flush()
+                os.fsync(f.fileno())
+            new_rows = self._refresh()
+        return [row['id'] for row in new_rows[-len(records):]]
+
+    def refresh(self):
+        """Read rows appended since the last call and return them (oldest first)"""
+        with self._lock:
+            if not self._changed():
+                return []
+            with file_lock(self.lock_path):
+                return self._refresh()
+
+    def _changed(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return self._inode is not None
+        return (st.st_ino != self._inode or st.st_size != self._offset
+                or st.st_mtime_ns != self._mtime)
+
+    def _refresh(self):
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                if self._inode is not None:
+                    self._reset()
+                return []
+
+            # File replaced or truncated: index it again from the start
+            if st.st_ino != self._inode or st.st_size < self._offset:
+                self._reset()
+                self._inode = st.st_ino
+
+            if st.st_size == self._offset and st.st_mtime_ns == self._mtime:
+                return []
+
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                chunk = f.read()
+            self._mtime = st.st_mtime_ns
+
+            # Only consume complete lines; a half-written row is read next time
+            end = chunk.rfind(b'\n') + 1
+            if not end:
+                return []
+            self._offset += end
+
+            new_rows = []
+            reader = csv.reader(io.StringIO(chunk[:end].decode('utf-8'), newline=''))
+            for values in reader:
+                if not values:
+                    continue
+                if self._header is None:
+                    self._header = values
+                    continue
+                # Files created before a column was added keep their old header
+                header = self._header if len(values) <= len(self._header) else CSV_HEADERS
+                values += [''] * (len(header) - len(values))
+                row = dict(zip(header, values))
+                row['id'] = len(self._rows) + 1
+                if self._rows and row.get('Sana', '') < self._rows[-1].get('Sana', ''):
+                    self._dates_in_order = False
+                self._rows.append(row)
+                self._day_counts[row.get('Sana', '')[:10]] += 1
+                new_rows.append(row)
+
+            if new_rows:
+                self._index(new_rows)
+                for listener in self._listeners:
+                    listener.add(new_rows)
+            return new_rows
+
+    def _index(self, new_rows):
+        """Add appended rows to the page() indexes built so far"""
+        for field, groups in self._by_value.items():
+            header = FILTER_FIELDS[field][0]
+            for row in new_rows:
+                groups.setdefault(row.get(header, ''), []).append(row)
+        self._current.extend(new_rows)
+        for sorted_rows in (self._sorted, self._sorted_current):
+            for sort, rows in sorted_rows.items():
+                key = self._sort_key(sort)
+                if len(new_rows) > 64:
+                    rows.extend(new_rows)
+                    rows.sort(key=key)
+                else:
+                    for row in new_rows:
+                        bisect.insort(rows, row, key=key)
+
+        # Applications a new row replaces leave the current-only indexes
+        for row in new_rows:
+            previous = self._replaced_row(row)
+            if previous is None:
+                continue
+            self._replaced.add(previous['id'])
+            self._remove(self._current, previous, lambda app: app['id'])
+            for sort, rows in self._sorted_current.items():
+                self._remove(rows, previous, self._sort_key(sort))
+
+    def _replaced_row(self, row):
+        """The earlier, not yet replaced row named by row's 'Oldingi ID', or None"""
+        previous = row.get('Oldingi ID', '')
+        if not previous.isdigit():
+            return None
+        previous_id = int(previous)
+        if previous_id in self._replaced or not 1 <= previous_id < row['id']:
+            return None
+        return self._rows[previous_id - 1]
+
+    @staticmethod
+    def _remove(rows, row, key):
+        """Remove row from rows sorted by key (keys are unique)"""
+        i = bisect.bisect_left(rows, key(row), key=key)
+        if i < len(rows) and rows[i] is row:
+            del rows[i]
+
+    @staticmethod
+    def _sort_key(sort):
+        header = SORT_FIELDS[sort][0]
+        return lambda row: (row.get(header, ''), row['id'])
+
+    def _rows_by_value(self, field, value):
+        """Rows whose filter field equals value, by id"""
+        if field not in self._by_value:
+            header = FILTER_FIELDS[field][0]
+            groups = {}
+            for row in self._rows:
+                groups.setdefault(row.get(header, ''), []).append(row)
+            self._by_value[field] = groups
+        return self._by_value[field].get(value, [])
+
+    def _rows_sorted(self, sort, current_only=False):
+        """All (or all current) rows in (sort field, id) order"""
+        rows = self._current if current_only else self._rows
+        if sort == 'id' or (sort == 'date' and self._dates_in_order):
+            return rows
+        sorted_rows = self._sorted_current if current_only else self._sorted
+        if sort not in sorted_rows:
+            sorted_rows[sort] = sorted(rows, key=self._sort_key(sort))
+        return sorted_rows[sort]
+
+    def subscribe(self, listener):
+        """
+        Feed all indexed rows to listener now and every new row later.
+        The rows indexed so far are fed without holding the store's lock, so
+        a slow listener (e.g. the search index) doesn't block readers.
+        """
+        with self._lock:
+            self.refresh()
+            rows = self._rows
+            count = len(rows)
+        if count:
+            listener.add(rows[:count])
+        with self._lock:
+            self.refresh()
+            if self._rows is not rows:
+                # The file was replaced meanwhile; start over from its rows
+                listener.clear()
+                count = 0
+            if len(self._rows) > count:
+                listener.add(self._rows[count:])
+            self._listeners.append(listener)
+
+    def all(self, current_only=False):
+        """
+        All applications (or those not replaced by a later one), newest first.
+        Reversed per call: appending a row doesn't copy every row.
+        """
+        with self._lock:
+            self.refresh()
+            return (self._current if current_only else self._rows)[::-1]
+
+    def superseded_ids(self):
+        """Ids of the applications a later one names as its 'Oldingi ID'"""
+        with self._lock:
+            self.refresh()
+            return set(self._replaced)
+
+    def get(self, app_id):
+        """Application by id, or None"""
+        self.refresh()
+        if 1 <= app_id <= len(self._rows):
+            return self._rows[app_id - 1]
+        return None
+
+    def count(self):
+        """Total number of applications"""
+        self.refresh()
+        return len(self._rows)
+
+    def count_on(self, day):
+        """Number of applications submitted on a YYYY-MM-DD day"""
+        self.refresh()
+        return self._day_counts[day]
+
+    def version(self):
+        """Token that changes whenever the set of applications changes"""
+        with self._lock:
+            self.refresh()
+            return f"{self._inode}-{len(self._rows)}"
+
+    def last_modified(self, refresh=True):
+        """
+        POSIX time of the last write to the applications file, or None.
+        Listeners pass refresh=False: the file as of the rows being published.
+        """
+        with self._lock:
+            if refresh:
+                self.refresh()
+            return self._mtime / 1e9 if self._mtime else None
+
+    def page(self, limit=50, offset=0, cursor=None, sort='id', order='desc',
+             date_from=None, date_to=None, filters=None, current_only=False):
+        """
+        One page of applications and the total number matching the filters;
+        current_only leaves out applications replaced by a later one
+        """
+        with self._lock:
+            self.refresh()
+            date_until = next_day(date_to) if date_to else None
+
+            if filters:
+                # The smallest matching group (by id), narrowed by the rest
+                rows = min((self._rows_by_value(field, value) for field, value in filters.items()),
+                           key=len)
+                if len(filters) > 1 or date_from or date_until:
+                    rows = [app for app in rows if matches_filters(app, date_from, date_until, filters)]
+                if current_only and self._replaced:
+                    rows = [app for app in rows if app['id'] not in self._replaced]
+            elif date_from or date_until:
+                # A date range is one slice of the rows in date order
+                by_date = self._rows_sorted('date', current_only)
+                key = lambda app: app.get('Sana', '')
+                start = bisect.bisect_left(by_date, date_from, key=key) if date_from else 0
+                end = bisect.bisect_left(by_date, date_until, key=key) if date_until else len(by_date)
+                rows = by_date[start:end]
+                if not self._dates_in_order:
+                    rows.sort(key=lambda app: app['id'])
+            else:
+                rows = self._rows_sorted(sort, current_only)
+                cursor = cursor if sort == 'id' else None
+                return slice_page(rows, limit, offset, cursor, order), len(rows)
+
+            # Filtered rows are by id; only the (smaller) match set is sorted
+            if sort == 'id' or (sort == 'date' and self._dates_in_order):
+                return slice_page(rows, limit, offset, cursor if sort == 'id' else None, order), len(rows)
+            return slice_page(sorted(rows, key=self._sort_key(sort)), limit, offset, None, order), len(rows)
+
+# ============================================================================
+# SQLITE STORE
+# ============================================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sana TEXT NOT NULL,
+    ism TEXT NOT NULL,
+    telefon TEXT NOT NULL,
+    username TEXT NOT NULL,
+    chat_id TEXT NOT NULL,
+    file_id TEXT NOT NULL,
+    fayl_nomi TEXT NOT NULL,
+    file_unique_id TEXT NOT NULL DEFAULT '',
+    previous_id TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_applications_sana ON applications (sana);
+CREATE INDEX IF NOT EXISTS idx_applications_telefon ON applications (telefon);
+CREATE INDEX IF NOT EXISTS idx_applications_chat_id ON applications (chat_id);
+CREATE INDEX IF NOT EXISTS idx_applications_ism ON applications (ism);
+"""
+
+SELECT_COLUMNS = "id, " + ", ".join(SQL_COLUMNS)
+
+# Ids of the applications a later one names as its previous_id
+SUPERSEDED_IDS_SQL = "SELECT CAST(previous_id AS INTEGER) FROM applications WHERE previous_id > ''"
+
+
+class SqliteApplicationStore:
+    """
+    SQLite-backed application storage.
+
+    WAL mode lets the bot write while admin panel workers read, from any
+    number of processes. Each thread gets its own connection. Listeners
+    registered with subscribe() are fed new rows on each refresh().
+    """
+
+    def __init__(self, path=SQLITE_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._last_id = 0
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Every commit is fsynced (durable); the bot's writer batches commits
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _migrate(conn):
+        """Add columns introduced after the database was created"""
+        existing = {info[1] for info in conn.execute("PRAGMA table_info(applications)")}
+        for column in SQL_COLUMNS:
+            if column not in existing:
+                conn.execute(
+                    f"ALTER TABLE applications ADD COLUMN {column} TEXT NOT NULL DEFAULT ''"
+                )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_applications_previous_id ON applications (previous_id)")
+        conn.commit()
+
+    @staticmethod
+    def _to_row(values):
+        row = dict(zip(CSV_HEADERS, values[1:]))
+        row['id'] = values[0]
+        return row
+
+    def _query(self, sql, params=()):
+        return [self._to_row(values) for values in self._connect().execute(sql, params)]
+
+    def init(self):
+        """Create the database, table and indexes if they don't exist"""
+        created = not os.path.exists(self.path)
+        self._connect()
+        return created
+
+    def append(self, data: dict):
+        """Insert an application and return its id"""
+        return self.append_many([data])[0]
+
+    def append_many(self, records):
+        """Insert applications in one transaction (one fsync) and return their ids"""
+        placeholders = ", ".join("?" for _ in SQL_COLUMNS)
+        sql = f"INSERT INTO applications ({', '.join(SQL_COLUMNS)}) VALUES ({placeholders})"
+        with self._connect() as conn:
+            ids = [conn.execute(sql, record_to_values(data)).lastrowid for data in records]
+        # Let listeners (indexes) see the new rows right away
+        self.refresh()
+        return ids
+
+    def refresh(self):
+        """Rows inserted (by any process) since the last call, oldest first"""
+        with self._lock:
+            new_rows = self._query(
+                f"SELECT {SELECT_COLUMNS} FROM applications WHERE id > ? ORDER BY id",
+                (self._last_id,)
+            )
+            if new_rows:
+                self._last_id = new_rows[-1]['id']
+                for listener in self._listeners:
+                    listener.add(new_rows)
+            return new_rows
+
+    def subscribe(self, listener):
+        """
+        Feed all existing rows to listener now and every new row later.
+        The rows seen so far are fed without holding the store's lock, so a
+        slow listener (e.g. the search index) doesn't block readers.
+        """
+        with self._lock:
+            self.refresh()
+            last_id = self._last_id
+        rows = self._query(
+            f"SELECT {SELECT_COLUMNS} FROM applications WHERE id <= ? ORDER BY id", (last_id,)
+        )
+        if rows:
+            listener.add(rows)
+        with self._lock:
+            self.refresh()
+            rows = self._query(
+                f"SELECT {SELECT_COLUMNS} FROM applications WHERE id > ? AND id <= ? ORDER BY id",
+                (last_id, self._last_id)
+            )
+            if rows:
+                listener.add(rows)
+            self._listeners.append(listener)
+
+    def all(self, current_only=False):
+        """All applications (or those not replaced by a later one), newest first"""
+        where_sql = f" WHERE id NOT IN ({SUPERSEDED_IDS_SQL})" if current_only else ""
+        return self._query(f"SELECT {SELECT_COLUMNS} FROM applications{where_sql} ORDER BY id DESC")
+
+    def superseded_ids(self):
+        """Ids of the applications a later one names as its previous_id"""
+        return {row[0] for row in self._connect().execute(SUPERSEDED_IDS_SQL)}
+
+    def get(self, app_id):
+        """Application by id, or None"""
+        rows = self._query(f"SELECT {SELECT_COLUMNS} FROM applications WHERE id = ?", (app_id,))
+        return rows[0] if rows else None
+
+    def count(self):
+        """Total number of applications"""
+        return self._connect().execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def version(self):
+        """Token that changes whenever the set of applications changes"""
+        max_id, total = self._connect().execute(
+            "SELECT MAX(id), COUNT(*) FROM applications"
+        ).fetchone()
+        return f"{max_id or 0}-{total}"
+
+    def last_modified(self, refresh=True):
+        """POSIX time of the last write to the database (or its WAL), or None (never refreshes)"""
+        times = []
+        for path in (self.path, self.path + '-wal'):
+            try:
+                times.append(os.stat(path).st_mtime)
+            except FileNotFoundError:
+                pass
+        return max(times) if times else None
+
+    def count_on(self, day):
+        """Number of applications submitted on a YYYY-MM-DD day (uses the date index)"""
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM applications WHERE sana >= ? AND sana < ?",
+            (day, next_day(day))
+        ).fetchone()[0]
+
+    def page(self, limit=50, offset=0, cursor=None, sort='id', order='desc',
+             date_from=None, date_to=None, filters=None, current_only=False):
+        """
+        One page of applications and the total number matching the filters;
+        current_only leaves out applications replaced by a later one
+        """
+        where, params = [], []
+        if date_from:
+            where.append("sana >= ?")
+            params.append(date_from)
+        if date_to:
+            where.append("sana < ?")
+            params.append(next_day(date_to))
+        for field, value in (filters or {}).items():
+            where.append(f"{FILTER_FIELDS[field][1]} = ?")
+            params.append(value)
+        if current_only:
+            where.append(f"id NOT IN ({SUPERSEDED_IDS_SQL})")
+
+        where_sql = f" WHERE {' AND '.join(where)}" if where else ""
+        total = self._connect().execute(
+            f"SELECT COUNT(*) FROM applications{where_sql}", params
+        ).fetchone()[0]
+
+        # Keyset pagination: continue after the last id of the previous page
+        if cursor is not None and sort == 'id':
+            where.append("id > ?" if order == 'asc' else "id < ?")
+            params.append(cursor)
+            where_sql = f" WHERE {' AND '.join(where)}"
+
+        direction = "ASC" if order == 'asc' else "DESC"
+        rows = self._query(
+            f"SELECT {SELECT_COLUMNS} FROM applications{where_sql} "
+            f"ORDER BY {SORT_FIELDS[sort][1]} {direction}, id {direction} LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+        return rows, total
+
+    def import_csv(self, csv_path=CSV_FILE):
+        """
+        One-shot import from an existing applications.csv.
+        CSV row numbers become ids, so /download/<id> links stay valid and
+        running the import twice does not duplicate rows.
+        """
+        rows = CsvApplicationStore(csv_path).all()[::-1]
+        columns = ", ".join(['id'] + SQL_COLUMNS)
+        placeholders = ", ".join("?" for _ in range(len(SQL_COLUMNS) + 1))
+        with self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO applications ({columns}) VALUES ({placeholders})",
+                ([row['id']] + [row.get(header, '') for header in CSV_HEADERS] for row in rows)
+            )
+            return conn.total_changes - before
+
+    def export_csv(self, csv_path=CSV_FILE):
+        """Write all applications to a CSV file in the bot's original format"""
+        with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(CSV_HEADERS)
+            for values in self._connect().execute(
+                    f"SELECT {', '.join(SQL_COLUMNS)} FROM applications ORDER BY id"):
+                writer.writerow(values)
+
+# ============================================================================
+# BACKEND SELECTION
+# ============================================================================
+
+def get_store(backend=None, campaign=None):
+    """
+    Create the application store selected by STORAGE_BACKEND, in the
+    campaign's folder if one is given (see campaigns.Campaign.path)
+    """
+    backend = (backend or STORAGE_BACKEND).lower()
+    path = campaign.path if campaign else (lambda filename: filename)
+    if backend == "sqlite":
+        return SqliteApplicationStore(path(SQLITE_FILE))
+    if backend == "csv":
+        return CsvApplicationStore(path(CSV_FILE))
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    csv_path = sys.argv[2] if len(sys.argv) > 2 else CSV_FILE
+
+    if command == 'import':
+        imported = SqliteApplicationStore(SQLITE_FILE).import_csv(csv_path)
+        print(f"✅ Imported {imported} application(s) from {csv_path} into {SQLITE_FILE}")
+    elif command == 'export':
+        SqliteApplicationStore(SQLITE_FILE).export_csv(csv_path)
+        print(f"✅ Exported applications from {SQLITE_FILE} to {csv_path}")
+    else:
+        print(__doc__)
+        exit(1)
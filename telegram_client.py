@@ -0,0 +1,92 @@
+"""
+Shared Telegram client for the DMTT admin panel
+One asyncio event loop on a background thread and one initialized Bot with a
+pooled HTTP client per panel process. Request threads hand Telegram work to
+the loop instead of starting an event loop (and a new HTTP client, TLS
+handshake included) per request, so downloads from many requests share
+connections and run concurrently.
+
+    pdf = telegram_client.call(lambda bot: download_pdf_async(file_id, name, bot))
+
+python-telegram-bot (and httpx under it) is imported when the first Bot is
+created, not when the panel starts.
+"""
+
+import asyncio
+import os
+import threading
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+PANEL_POOL_SIZE = int(os.getenv("PANEL_POOL_SIZE", "32"))
+PANEL_POOL_TIMEOUT = float(os.getenv("PANEL_POOL_TIMEOUT", "30"))
+PANEL_CONNECT_TIMEOUT = float(os.getenv("PANEL_CONNECT_TIMEOUT", "10"))
+PANEL_READ_TIMEOUT = float(os.getenv("PANEL_READ_TIMEOUT", "60"))
+
+# Self-hosted Bot API server (same setting as the bot)
+BOT_API_BASE_URL = os.getenv("BOT_API_BASE_URL", "").rstrip('/')
+
+# ============================================================================
+# TELEGRAM CLIENT
+# ============================================================================
+
+class TelegramClient:
+    """Long-lived Bot on a dedicated event loop thread, shared by all request threads"""
+
+    def __init__(self, token, pool_size=PANEL_POOL_SIZE):
+        self.token = token
+        self.pool_size = pool_size
+        self._loop = None
+        self._bot_task = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, daemon=True).start()
+            return self._loop
+
+    def _new_bot(self):
+        from telegram import Bot
+        from telegram.request import HTTPXRequest
+
+        request = HTTPXRequest(
+            connection_pool_size=self.pool_size,
+            pool_timeout=PANEL_POOL_TIMEOUT,
+            connect_timeout=PANEL_CONNECT_TIMEOUT,
+            read_timeout=PANEL_READ_TIMEOUT,
+        )
+        if BOT_API_BASE_URL:
+            return Bot(token=self.token, request=request,
+                       base_url=f"{BOT_API_BASE_URL}/bot",
+                       base_file_url=f"{BOT_API_BASE_URL}/file/bot")
+        return Bot(token=self.token, request=request)
+
+    async def _create_bot(self):
+        bot = self._new_bot()
+        await bot.initialize()
+        return bot
+
+    async def get_bot(self):
+        """The shared Bot, initialized on first use (call on the client's loop)"""
+        if self._bot_task is None or (self._bot_task.done() and self._bot_task.exception()):
+            # First use, or the last attempt failed (e.g. Telegram was unreachable)
+            self._bot_task = asyncio.ensure_future(self._create_bot())
+        return await asyncio.shield(self._bot_task)
+
+    def submit(self, fn):
+        """Run coroutine function fn(bot) on the shared loop; returns a concurrent Future"""
+        async def run():
+            return await fn(await self.get_bot())
+        return asyncio.run_coroutine_threadsafe(run(), self._ensure_loop())
+
+    def spawn(self, coro):
+        """Run a long-lived coroutine (a background worker) on the shared loop"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def call(self, fn, timeout=None):
+        """Run fn(bot) on the shared loop and wait for its result"""
+        return self.submit(fn).result(timeout)
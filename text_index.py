@@ -0,0 +1,234 @@
+"""
+Full-text search over application PDFs for DMTT Application Bot
+The text that pdf_checker.py extracts from each PDF is indexed in SQLite FTS5
+(pdf_text.db), twice: as written, for snippets, and transliterated to Latin
+(see search_index.normalize_name), so "Farg'ona" also finds "Фарғона".
+
+The bot adds each document as soon as its check is done; the admin panel
+only reads. Every campaign has its own index (see campaigns.py). Rebuild
+the indexes (or one campaign's) from the PDF cache with:
+
+    python text_index.py reindex [--campaign SLUG] [--workers 8] [--force]
+"""
+
+import argparse
+import html
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from search_index import normalize_name
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+TEXT_INDEX_FILE = os.getenv("TEXT_INDEX_FILE", "pdf_text.db")
+
+DEFAULT_LIMIT = 20
+
+# Words of context around the matches in a snippet
+SNIPPET_WORDS = 16
+
+# Highlight markers inside FTS snippets (private use characters, never in PDF text)
+MARK_START = '\ue000'
+MARK_END = '\ue001'
+
+# Documents written per transaction when reindexing
+REINDEX_BATCH = 200
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS pdf_text USING fts5(
+    body, latin, tokenize = "unicode61 remove_diacritics 2"
+);
+CREATE TABLE IF NOT EXISTS pdf_text_docs (
+    app_id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+"""
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def fts_terms(words):
+    """Words as FTS5 prefix phrases ("word"*), all of which must match"""
+    return " ".join(f'"{word.replace(chr(34), chr(34) * 2)}"*' for word in words if word)
+
+def build_match(query: str):
+    """
+    FTS5 MATCH expression for a search box query: every word (or word prefix)
+    must occur, either as written or transliterated. None for an empty query.
+    """
+    words = query.split()
+    body = fts_terms(word.lower() for word in words)
+    latin = fts_terms(normalize_name(word) for word in words)
+    parts = [f"body : ({body})" if body else "", f"latin : ({latin})" if latin else ""]
+    parts = [part for part in parts if part]
+    return " OR ".join(parts) or None
+
+def snippet_html(snippet: str) -> str:
+    """Escape a snippet and turn its highlight markers into <mark> tags"""
+    return (html.escape(snippet)
+            .replace(MARK_START, '<mark>')
+            .replace(MARK_END, '</mark>'))
+
+def load_document(job):
+    """
+    Worker process: text of one cached PDF, extracting it again when the
+    text file is missing. Returns (app_id, digest, text, latin) or None.
+    """
+    from pdf_checker import inspect_pdf
+
+    app_id, digest, pdf_path, text_path, thumbnail_path = job
+    if not os.path.exists(text_path):
+        if not os.path.exists(pdf_path) or inspect_pdf(pdf_path, text_path, thumbnail_path)['problem']:
+            return None
+    with open(text_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    return app_id, digest, text, normalize_name(text)
+
+# ============================================================================
+# TEXT INDEX
+# ============================================================================
+
+class PdfTextIndex:
+    """FTS5 index of PDF text by application id (one connection per thread)"""
+
+    def __init__(self, path=TEXT_INDEX_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def add_many(self, docs):
+        """Index (app_id, digest, text, latin) tuples, replacing earlier text of those ids"""
+        docs = list(docs)
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany("DELETE FROM pdf_text WHERE rowid = ?", [(doc[0],) for doc in docs])
+            conn.executemany(
+                "INSERT INTO pdf_text (rowid, body, latin) VALUES (?, ?, ?)",
+                [(app_id, text, latin) for app_id, _, text, latin in docs]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO pdf_text_docs (app_id, digest, indexed_at) VALUES (?, ?, ?)",
+                [(app_id, digest, now) for app_id, digest, _, _ in docs]
+            )
+
+    def add_file(self, app_id, digest, text_path):
+        """Index the extracted text of one application's PDF"""
+        with open(text_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        self.add_many([(app_id, digest, text, normalize_name(text))])
+
+    def indexed(self):
+        """Digest of the indexed document, by application id"""
+        return dict(self._connect().execute("SELECT app_id, digest FROM pdf_text_docs"))
+
+    def count(self):
+        """Number of indexed documents"""
+        return self._connect().execute("SELECT COUNT(*) FROM pdf_text_docs").fetchone()[0]
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """
+        Best matching applications for a query, best first:
+        [{'id', 'snippet' (HTML with <mark>), 'score'}]
+        """
+        match = build_match(query)
+        if not match:
+            return []
+        rows = self._connect().execute(
+            "SELECT rowid, bm25(pdf_text), "
+            f"snippet(pdf_text, 0, ?, ?, '…', {SNIPPET_WORDS}), "
+            f"snippet(pdf_text, 1, ?, ?, '…', {SNIPPET_WORDS}) "
+            "FROM pdf_text WHERE pdf_text MATCH ? ORDER BY rank LIMIT ?",
+            (MARK_START, MARK_END, MARK_START, MARK_END, match, limit)
+        ).fetchall()
+        # Show the original text unless only the transliteration matched
+        return [
+            {
+                'id': app_id,
+                'snippet': snippet_html(body if MARK_START in body else latin),
+                'score': round(-rank, 4),
+            }
+            for app_id, rank, body, latin in rows
+        ]
+
+    def reindex(self, checks, cache, workers=None, force=False):
+        """
+        (Re)index every valid checked PDF in the cache, reading (and, if
+        needed, extracting) the texts in `workers` processes. checks is a
+        PdfChecker. Returns (indexed, missing) counts.
+        """
+        indexed = {} if force else self.indexed()
+        jobs = [
+            (app_id, digest, cache.object_path(digest),
+             cache.derived_path(digest, '.txt'), cache.derived_path(digest, '.png'))
+            for app_id, digest in checks.valid_digests()
+            if indexed.get(app_id) != digest
+        ]
+
+        done = missing = 0
+        batch = []
+        with ProcessPoolExecutor(workers) as pool:
+            for doc in pool.map(load_document, jobs, chunksize=16):
+                if doc is None:
+                    missing += 1
+                    continue
+                batch.append(doc)
+                if len(batch) >= REINDEX_BATCH:
+                    self.add_many(batch)
+                    done += len(batch)
+                    batch = []
+                    print(f"  {done}/{len(jobs)}", flush=True)
+        if batch:
+            self.add_many(batch)
+            done += len(batch)
+        return done, missing
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('command', choices=['reindex'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="processes reading and extracting PDF text")
+    parser.add_argument('--force', action='store_true', help="reindex documents already indexed")
+    parser.add_argument('--campaign', help="only this campaign (default: all)")
+    args = parser.parse_args()
+
+    from campaigns import load_campaigns
+    from pdf_cache import PdfCache
+    from pdf_checker import PDF_CHECK_FILE, PdfChecker
+    from storage import get_store
+
+    campaigns = load_campaigns()
+    if args.campaign:
+        if args.campaign not in campaigns:
+            parser.error(f"unknown campaign: {args.campaign}")
+        campaigns = {args.campaign: campaigns[args.campaign]}
+
+    cache = PdfCache()
+    for campaign in campaigns.values():
+        started = time.perf_counter()
+        index = PdfTextIndex(campaign.path(TEXT_INDEX_FILE))
+        checks = PdfChecker(get_store(campaign=campaign), path=campaign.path(PDF_CHECK_FILE))
+        done, missing = index.reindex(checks, cache, args.workers, args.force)
+        print(f"✅ {campaign.slug}: indexed {done} document(s) in {time.perf_counter() - started:.1f}s "
+              f"({index.count()} in {index.path})")
+        if missing:
+            print(f"⚠️ {campaign.slug}: skipped {missing} PDF(s) no longer in the cache (evicted)")
@@ -0,0 +1,115 @@
+"""
+Application writer for DMTT Application Bot
+
+All applications are stored by one background task fed through a queue.
+Rows that arrive while a write is in progress (or within WRITE_BATCH_INTERVAL
+of the first one) are group-committed: one append_many() call, one locked
+write and one fsync for the whole batch. Each caller is answered only once
+its row is durable:
+
+    app_id = await writer.submit(application_data)
+"""
+
+import asyncio
+import logging
+import os
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Seconds to wait for more rows before committing a batch (0 = commit at once)
+WRITE_BATCH_INTERVAL = float(os.getenv("WRITE_BATCH_INTERVAL", "0.05"))
+WRITE_BATCH_SIZE = int(os.getenv("WRITE_BATCH_SIZE", "100"))
+
+# ============================================================================
+# APPLICATION WRITER
+# ============================================================================
+
+class ApplicationWriter:
+    """
+    Queue plus a background task group-committing to store.append_many().
+
+    Hook it into the Application lifecycle (like AdminNotifier); until
+    start() runs, submit() writes straight to the store.
+    """
+
+    def __init__(self, store, interval=WRITE_BATCH_INTERVAL, batch_size=WRITE_BATCH_SIZE):
+        self.store = store
+        self.interval = interval
+        self.batch_size = batch_size
+        self._queue = None
+        self._task = None
+
+    async def submit(self, data: dict):
+        """Store an application; returns its id once it is on disk"""
+        if self._task is None:
+            return (await asyncio.to_thread(self.store.append_many, [data]))[0]
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((data, future))
+        return await future
+
+    async def start(self, application):
+        """post_init hook: start the writer task"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, application):
+        """post_stop hook: commit whatever is still queued, then stop"""
+        if self._task:
+            await self._queue.put(None)
+            await self._task
+            self._task = None
+
+    async def _collect(self):
+        """
+        Wait for one row, then gather more until the interval or batch size
+        is reached. The stop sentinel (None) ends the batch and the task.
+        """
+        item = await self._queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.interval
+        while len(batch) < self.batch_size:
+            if self._queue.empty():
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            else:
+                item = self._queue.get_nowait()
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _commit(self, batch):
+        metrics.STORAGE_WRITE_BATCH_ROWS.observe(len(batch))
+        try:
+            ids = await asyncio.to_thread(self.store.append_many, [data for data, _ in batch])
+        except Exception as e:
+            logger.error(f"Error writing {len(batch)} application(s): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), app_id in zip(batch, ids):
+            if not future.done():
+                future.set_result(app_id)
+
+    async def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._collect()
+            # Rows queued while this batch is written go into the next one
+            if batch:
+                await self._commit(batch)